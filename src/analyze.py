@@ -0,0 +1,164 @@
+"""Analyzes recorded games in bulk across a process pool and streams per-move evaluations to a JSONL file.
+
+Games are read in the JSONL format written by selfplay.py and replayed through Game, so an illegal move in a record is
+reported rather than analyzed. Every position is searched once, however many games reach it: positions are
+deduplicated by their Zobrist key before they are handed to the workers. A played move is scored by the search of the
+position it leads to, which is also in the game, so each position needs a single search. A move is flagged as a
+blunder when it loses at least the blunder threshold compared to the best move found.
+"""
+import json
+import os
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, Future
+from time import perf_counter
+
+from bitboard import BLACK
+from evaluation import load_evaluation
+from game import Game
+from perft import parse_position, format_position
+from search import Engine
+from tablebase import open_tablebase
+
+WORKER_ENGINE = None  # Engine of the current worker process, created by init_worker and kept between positions.
+
+# Defaults of the analysis.
+DEPTH = 6
+BLUNDER = 150  # Hundredths of a pawn a move must lose against the best move to be flagged.
+TABLE_MEMORY_MB = 16
+
+
+def init_worker(time_limit: float, node_limit: int, max_depth: int, table_memory_mb: float, tablebase_path: str,
+                evaluation_path: str) -> None:
+    """Pool initializer that creates the worker's engine, its transposition table is kept between positions."""
+    global WORKER_ENGINE
+    tablebase = open_tablebase(tablebase_path) if tablebase_path else None
+    WORKER_ENGINE = Engine(time_limit=time_limit, node_limit=node_limit, max_depth=max_depth,
+                           table_memory_mb=table_memory_mb, tablebase=tablebase,
+                           evaluation=load_evaluation(evaluation_path))
+
+
+def analyze_position(dimensions: int, position: str) -> dict:
+    """Worker task that searches one position, sent in perft.py's notation to keep it small. Returns the best move's
+    path and score for the side to move, and the search's depth and node count."""
+    board, color = parse_position(position, dimensions)
+    result = WORKER_ENGINE.search(board, color)
+    return {
+        'best': list(result.move.path) if result.move else None,
+        'score': result.score,
+        'depth': result.depth,
+        'nodes': result.nodes,
+    }
+
+
+def replay(record: dict) -> list[tuple[int, str, int, list[int]]]:
+    """Replays a recorded game through the rules and returns (key, position, color, played path) for every position
+    of the game, including the last one, which has no played path. Raises ValueError on an illegal move."""
+    game = Game(record['dimensions'], record['rows'])
+    positions = []
+    for ply, path in enumerate(record['moves']):
+        move = game.move_paths.get(tuple(path))
+        if not move:
+            raise ValueError(f"Illegal move {path} at ply {ply}.")
+        positions.append((game.bitboard.key(game.turn), format_position(game.bitboard, game.turn), game.turn, path))
+        game.play_move(move)
+        game.end_turn()
+    positions.append((game.bitboard.key(game.turn), format_position(game.bitboard, game.turn), game.turn, None))
+    return positions
+
+
+def move_records(number: int, positions: list, analyses: list[dict], blunder: int) -> list[dict]:
+    """Returns the evaluation record of every move of a game from the analyses of its positions. A move's score is
+    the negated score of the position it leads to, from the opponent's side."""
+    # Forced moves are played without searching, so those positions take their score from the position after them.
+    scores = [analysis['score'] for analysis in analyses]
+    for ply in reversed(range(len(analyses) - 1)):
+        if analyses[ply]['best'] and not analyses[ply]['depth']:
+            scores[ply] = -scores[ply + 1]
+
+    records = []
+    for ply, ((key, position, color, path), analysis) in enumerate(zip(positions, analyses)):
+        if path is None:
+            break
+        played = -scores[ply + 1]
+        # The best move's own score is the one searched from this position, its successor was searched a ply deeper.
+        loss = 0 if path == analysis['best'] else max(0, scores[ply] - played)
+        records.append({
+            'game': number,
+            'ply': ply,
+            'color': 'black' if color == BLACK else 'red',
+            'move': path,
+            'score': played,
+            'best': analysis['best'],
+            'best_score': scores[ply],
+            'loss': loss,
+            'blunder': loss >= blunder,
+            'depth': analysis['depth'],
+        })
+    return records
+
+
+def main():
+    """Runs the analysis from the command line."""
+    parser = ArgumentParser(description="Search every position of recorded checkers games and flag blunders.")
+    parser.add_argument('--input', default='selfplay.jsonl', help="Path of the JSONL file of recorded games.")
+    parser.add_argument('--output', default='analysis.jsonl', help="Path of the JSONL file to write.")
+    parser.add_argument('--time', type=float, default=0, help="Seconds per position, or 0 for no time limit.")
+    parser.add_argument('--nodes', type=int, default=0, help="Positions searched per position, or 0 for no limit.")
+    parser.add_argument('--depth', type=int, default=DEPTH, help="Deepest iteration searched per position.")
+    parser.add_argument('--blunder', type=int, default=BLUNDER,
+                        help="Hundredths of a pawn a move must lose to be flagged as a blunder.")
+    parser.add_argument('--table-memory', type=float, default=TABLE_MEMORY_MB,
+                        help="Transposition table size of each worker in megabytes.")
+    parser.add_argument('--tablebase', default=None, help="Path of an endgame tablebase file to probe.")
+    parser.add_argument('--weights', default=None, help="Path of a JSON file of evaluation weights.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    arguments = parser.parse_args()
+
+    start_time = perf_counter()
+    games = []
+    with open(arguments.input) as file:
+        for index, line in enumerate(filter(str.strip, file)):
+            record = json.loads(line)
+            number = record.get('game', index)
+            try:
+                games.append((number, record['dimensions'], replay(record)))
+            except ValueError as error:
+                print(f'[GAME {number} SKIPPED] {error}')
+    total = sum(len(positions) for number, dimensions, positions in games)
+
+    blunders = 0
+    moves = 0
+    with open(arguments.output, 'w') as output, \
+            ProcessPoolExecutor(max_workers=arguments.workers, initializer=init_worker,
+                                initargs=(arguments.time, arguments.nodes, arguments.depth, arguments.table_memory,
+                                          arguments.tablebase, arguments.weights)) as executor:
+        # Submit every distinct position up front, in game order, so the workers run ahead of the writing below.
+        futures: dict[tuple[int, int], Future] = {}
+        for number, dimensions, positions in games:
+            for key, position, color, path in positions:
+                if (dimensions, key) not in futures:
+                    futures[dimensions, key] = executor.submit(analyze_position, dimensions, position)
+        print(f'[POSITIONS] {total} in {len(games)} games, {len(futures)} distinct '
+              f'({1 - len(futures) / max(1, total):.1%} deduplicated)')
+
+        # Write the games in order as their positions finish, streaming the records so a long run can be followed.
+        for finished, (number, dimensions, positions) in enumerate(games, 1):
+            analyses = [futures[dimensions, key].result() for key, position, color, path in positions]
+            for record in move_records(number, positions, analyses, arguments.blunder):
+                output.write(json.dumps(record) + '\n')
+                blunders += record['blunder']
+                moves += 1
+            output.flush()
+            if finished % max(1, len(games) // 10) == 0:
+                print(f'[ANALYZE] {finished}/{len(games)} games, {finished / (perf_counter() - start_time):.2f} '
+                      f'games/s')
+        nodes = sum(future.result()['nodes'] for future in futures.values())
+
+    elapsed = perf_counter() - start_time
+    print(f'[ANALYSIS DONE] {moves} moves of {len(games)} games in {elapsed:.1f}s ({nodes / elapsed:.0f} nodes/s), '
+          f'blunders: {blunders}')
+    print(f'[RESULTS WRITTEN]: {arguments.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
 from pygame.event import Event
-from pygame import Vector2, Surface
+from pygame import Vector2, Surface, Rect
 
 
 class Asset:
@@ -11,6 +11,7 @@ class Asset:
 
     Attributes:
         enabled: Boolean value that determines whether or not the asset is updated when update method is called.
+        dirty: Areas of the screen the asset changed since it was last drawn, for redrawing only those areas.
 
     """
 
@@ -20,6 +21,7 @@ class Asset:
 
         self.position = position
         self.enabled = True
+        self.dirty: list[Rect] = []
 
     def get_pos(self):
         """Gets the current position of the asset."""
@@ -46,6 +48,15 @@ class Asset:
         """Function that is not meant to be directly called by the client, internally called by self.update()."""
         pass
 
+    def mark_dirty(self, *rects: Rect) -> None:
+        """Records areas of the screen that must be redrawn because the asset changed how it looks there."""
+        self.dirty.extend(Rect(rect) for rect in rects)
+
+    def dirty_rects(self) -> list[Rect]:
+        """Returns the areas of the screen the asset changed since the last call and forgets them."""
+        rects, self.dirty = self.dirty, []
+        return rects
+
     def draw(self, screen: Surface):
         """Draws the asset on the screen surface."""
         pass
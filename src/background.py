@@ -2,6 +2,7 @@ import pygame
 from pygame import Surface
 from pygame.event import Event
 from asset import Asset
+from images import IMAGES
 
 
 class CheckeredBackground(Asset):
@@ -12,12 +13,13 @@ class CheckeredBackground(Asset):
         image_path (str): The path to the background image file.
 
     Attributes:
-        image: The background image.
+        image_path: The path of the background image, scaled to the screen and converted to its pixel format by the
+            image cache, so drawing it is a plain copy.
     """
 
     def __init__(self, image_path):
         super().__init__(pygame.Vector2(0, 0))
-        self.image = pygame.image.load(image_path)
+        self.image_path = image_path
 
     def process(self, events: list[Event]) -> None:
         """Process events for the background (no movement)."""
@@ -25,6 +27,5 @@ class CheckeredBackground(Asset):
 
     def draw(self, screen: Surface) -> None:
         """Draws the background image on the screen, scaling it to cover the whole screen."""
-        screen_width, screen_height = screen.get_size()
-        scaled_image = pygame.transform.scale(self.image, (screen_width, screen_height))
-        screen.blit(scaled_image, self.position)
\ No newline at end of file
+        # Scaled once per screen size, a resized window gets its own entry in the cache.
+        screen.blit(IMAGES.get(self.image_path, screen.get_size()), self.position)
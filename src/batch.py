@@ -0,0 +1,284 @@
+"""Move generation over a batch of boards at once with NumPy array operations, without depending on pygame.
+
+Boards are stored as an (N, dimensions, dimensions) int8 array holding the pawn identifiers of bitboard.py, with the
+color to move of each board in an (N,) array. Every rule is computed for the whole batch with shifted copies of the
+array, so advancing hundreds of games in lockstep costs a few array operations per hop instead of a Python loop per
+position.
+
+The array operations only pay for themselves over enough boards. Playing random games to the end on one core, with
+finished games dropped from the batch, 256 boards ran about 2x faster than the scalar generator on every size from
+8 x 8 to 20 x 20, and 4096 boards 3x to 5x. Batches of 64 boards barely break even and 16 boards run at a third of
+the scalar speed, so small batches are better played with movegen.
+"""
+from argparse import ArgumentParser
+from time import perf_counter
+
+import numpy as np
+
+from bitboard import Bitboard, EMPTY, RED_PAWN, BLACK_PAWN, RED_KING, BLACK_KING, BLACK, RED
+from game import NO_WIN, BLACK_WIN, RED_WIN
+from movegen import DIRECTIONS, generate_moves
+
+GHOST = -1  # A pawn captured earlier in the current chain, it blocks landings but cannot be jumped again.
+
+ROW_STEPS = np.array([d_row for d_row, d_col in DIRECTIONS])
+COL_STEPS = np.array([d_col for d_row, d_col in DIRECTIONS])
+UP = (0, 1)  # Indices of the directions towards row 0, the way black pawns move.
+
+
+def shifted(array: np.ndarray, d_row: int, d_col: int, fill) -> np.ndarray:
+    """Returns an array whose [n, row, col] is array[n, row + d_row, col + d_col], or fill where that is off the
+    board."""
+    dimensions = array.shape[1]
+    result = np.full_like(array, fill)
+    rows = slice(max(0, -d_row), min(dimensions, dimensions - d_row))
+    cols = slice(max(0, -d_col), min(dimensions, dimensions - d_col))
+    source_rows = slice(rows.start + d_row, rows.stop + d_row)
+    source_cols = slice(cols.start + d_col, cols.stop + d_col)
+    result[:, rows, cols] = array[:, source_rows, source_cols]
+    return result
+
+
+class BoardBatch:
+    """
+    A batch of positions that are advanced together.
+
+    Parameters:
+        boards: (N, dimensions, dimensions) int8 array of pawn identifiers.
+        colors: (N,) array of the color to move on each board.
+
+    Attributes:
+        boards: The positions, changed in place as moves are played.
+        colors: Color to move on each board.
+        dimensions: Length and width of the boards in spaces.
+    """
+
+    def __init__(self, boards: np.ndarray, colors: np.ndarray):
+        self.boards = boards.astype(np.int8)
+        self.colors = colors.astype(np.int8)
+        self.dimensions = boards.shape[1]
+
+    @classmethod
+    def starting(cls, count: int, dimensions: int, rows: int) -> 'BoardBatch':
+        """Returns count copies of the starting layout with black to move."""
+        grid = np.array(Bitboard.starting(dimensions, rows).to_grid(), dtype=np.int8)
+        return cls(np.repeat(grid[None], count, axis=0), np.full(count, BLACK))
+
+    @classmethod
+    def from_bitboards(cls, bitboards: list[Bitboard], colors: list[int]) -> 'BoardBatch':
+        """Builds a batch from bitboards and the color to move on each."""
+        return cls(np.array([board.to_grid() for board in bitboards], dtype=np.int8), np.array(colors))
+
+    def to_bitboards(self) -> list[Bitboard]:
+        """Returns the positions as bitboards."""
+        return [Bitboard.from_grid(board.tolist()) for board in self.boards]
+
+    def __len__(self) -> int:
+        return len(self.boards)
+
+    def select(self, mask: np.ndarray) -> 'BoardBatch':
+        """Returns a batch of the boards where mask is set, e.g. to drop finished games, which otherwise cost as much
+        as the ones still going."""
+        return BoardBatch(self.boards[mask], self.colors[mask])
+
+    def first_hops(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns (hops, captures) where hops is an (N, 4, dimensions, dimensions) mask of the origin of every legal
+        first hop of the side to move and captures an (N,) mask of the boards where the hops are forced jumps."""
+        own, opponents = sides(self.boards, self.colors)
+        board_movers = movers(self.boards, own)
+        board_jumps = jumps(self.boards, board_movers, opponents)
+        captures = board_jumps.any(axis=(1, 2, 3))
+        return np.where(captures[:, None, None, None], board_jumps, steps(self.boards, board_movers)), captures
+
+    def results(self) -> np.ndarray:
+        """Returns the result of each board, the side to move loses when it has no pawns or no legal moves."""
+        hops, captures = self.first_hops()
+        lost = ~hops.any(axis=(1, 2, 3))
+        return np.where(lost, np.where(self.colors == BLACK, RED_WIN, BLACK_WIN), NO_WIN).astype(np.int8)
+
+    def hop(self, choices: np.ndarray, jump: bool) -> np.ndarray:
+        """Plays the hops given as rows of (board, direction, row, col), leaving jumped pawns as ghosts and promoting
+        pawns that land on the far row. Returns the mask of the chosen hops that promoted."""
+        board, direction, row, col = choices.T
+        d_row = ROW_STEPS[direction] * (2 if jump else 1)
+        d_col = COL_STEPS[direction] * (2 if jump else 1)
+        pawn_id = self.boards[board, row, col]
+        self.boards[board, row, col] = EMPTY
+        if jump:
+            self.boards[board, row + d_row // 2, col + d_col // 2] = GHOST
+        land_row = row + d_row
+        promotes = ((pawn_id == BLACK_PAWN) & (land_row == 0)) | \
+                   ((pawn_id == RED_PAWN) & (land_row == self.dimensions - 1))
+        self.boards[board, land_row, col + d_col] = pawn_id + 2 * promotes
+        return promotes
+
+    def play_random(self, generator: np.random.Generator, active: np.ndarray = None) -> np.ndarray:
+        """Plays a random legal move on every active board that has one and passes the turn. Capture chains are
+        continued hop by hop until the pawn cannot jump again or is promoted. Returns the mask of boards moved."""
+        hops, captures = self.first_hops()
+        if active is not None:
+            hops &= active[:, None, None, None]
+        choices = choose(hops, generator)
+        moved = np.zeros(len(self), dtype=bool)
+        moved[choices[:, 0]] = True
+
+        # Continue the chains of the boards that jumped from the square each pawn landed on, only looking at the
+        # boards still jumping.
+        chains = choices[captures[choices[:, 0]]]
+        self.hop(choices[~captures[choices[:, 0]]], False)
+        while len(chains):
+            promotes = self.hop(chains, True)
+            chains = chains[~promotes]
+            if not len(chains):
+                break
+            indices = chains[:, 0]
+            boards = self.boards[indices]
+            landing = np.zeros(boards.shape, dtype=bool)
+            landing[np.arange(len(chains)), chains[:, 2] + 2 * ROW_STEPS[chains[:, 1]],
+                    chains[:, 3] + 2 * COL_STEPS[chains[:, 1]]] = True
+            own, opponents = sides(boards, self.colors[indices])
+            chains = choose(jumps(boards, movers(boards, own & landing), opponents), generator)
+            chains[:, 0] = indices[chains[:, 0]]
+
+        self.boards[self.boards == GHOST] = EMPTY  # The move is over, remove the captured pawns.
+        self.colors[moved] = 1 - self.colors[moved]
+        return moved
+
+
+def sides(boards: np.ndarray, colors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Returns (own, opponents) masks of the pawns of the side to move and of the other side on each board."""
+    black = (boards == BLACK_PAWN) | (boards == BLACK_KING)
+    red = (boards == RED_PAWN) | (boards == RED_KING)
+    black_to_move = (colors == BLACK)[:, None, None]
+    return np.where(black_to_move, black, red), np.where(black_to_move, red, black)
+
+
+def movers(boards: np.ndarray, own: np.ndarray) -> np.ndarray:
+    """Returns an (N, 4, dimensions, dimensions) mask of the own pawns allowed to move in each direction, pawns only
+    move forward while kings move both ways."""
+    kings = boards >= RED_KING
+    up = own & ((boards == BLACK_PAWN) | kings)
+    down = own & ((boards == RED_PAWN) | kings)
+    return np.stack([up if direction in UP else down for direction in range(len(DIRECTIONS))], axis=1)
+
+
+def steps(boards: np.ndarray, movers: np.ndarray) -> np.ndarray:
+    """Returns an (N, 4, dimensions, dimensions) mask of the origins of single steps in each direction."""
+    empty = boards == EMPTY
+    return np.stack([movers[:, direction] & shifted(empty, ROW_STEPS[direction], COL_STEPS[direction], False)
+                     for direction in range(len(DIRECTIONS))], axis=1)
+
+
+def jumps(boards: np.ndarray, movers: np.ndarray, opponents: np.ndarray) -> np.ndarray:
+    """Returns an (N, 4, dimensions, dimensions) mask of the origins of single jumps in each direction."""
+    empty = boards == EMPTY
+    return np.stack([movers[:, direction] &
+                     shifted(opponents, ROW_STEPS[direction], COL_STEPS[direction], False) &
+                     shifted(empty, 2 * ROW_STEPS[direction], 2 * COL_STEPS[direction], False)
+                     for direction in range(len(DIRECTIONS))], axis=1)
+
+
+def choose(mask: np.ndarray, generator: np.random.Generator) -> np.ndarray:
+    """Picks one set entry of mask at random for every board that has one, returned as rows of (board, direction,
+    row, col)."""
+    flat = mask.reshape(len(mask), -1)
+    keys = generator.random(flat.shape, dtype=np.float32)
+    keys[~flat] = -1  # Unset entries never win.
+    picks = keys.argmax(axis=1)
+    boards = np.flatnonzero(flat.any(axis=1))
+    return np.column_stack((boards, *np.unravel_index(picks[boards], mask.shape[1:])))
+
+
+def scalar_hops(board: Bitboard, color: int) -> set[tuple[int, int]]:
+    """Returns the (from, to) first hop of every legal move from the scalar move generator."""
+    return {(move.path[0], move.path[1]) for move in generate_moves(board, color)}
+
+
+def batch_hops(batch: BoardBatch) -> list[set[tuple[int, int]]]:
+    """Returns the (from, to) first hops of each board of the batch."""
+    hops, captures = batch.first_hops()
+    dimensions = batch.dimensions
+    result = [set() for board in range(len(batch))]
+    for board, direction, row, col in np.argwhere(hops):
+        distance = 2 if captures[board] else 1
+        land = (row + distance * ROW_STEPS[direction]) * dimensions + col + distance * COL_STEPS[direction]
+        result[board].add((int(row * dimensions + col), int(land)))
+    return result
+
+
+def verify(count: int, dimensions: int, rows: int, plies: int, seed: int) -> int:
+    """Plays count random games in lockstep and checks every position against the scalar rules: the first hops,
+    the result and that every move played is one of the scalar legal moves. Returns the number of mismatches."""
+    generator = np.random.default_rng(seed)
+    batch = BoardBatch.starting(count, dimensions, rows)
+    mismatches = 0
+    for ply in range(plies):
+        bitboards = batch.to_bitboards()
+        colors = batch.colors.tolist()
+        for board, color, hops in zip(bitboards, colors, batch_hops(batch)):
+            mismatches += hops != scalar_hops(board, color)
+
+        results = batch.results()
+        for board, color, result in zip(bitboards, colors, results):
+            scalar_lost = not generate_moves(board, color)
+            mismatches += (result != NO_WIN) != scalar_lost
+
+        active = results == NO_WIN
+        if not active.any():
+            break
+        batch.play_random(generator, active)
+        for index, (board, color) in enumerate(zip(bitboards, colors)):
+            if active[index]:
+                children = []
+                for move in generate_moves(board, color):
+                    child = board.copy()
+                    child.apply(move)
+                    children.append(child)
+                mismatches += Bitboard.from_grid(batch.boards[index].tolist()) not in children
+    return mismatches
+
+
+def main():
+    """Verifies the batched rules against the scalar ones and compares their speed."""
+    parser = ArgumentParser(description="Verify and benchmark batched move generation.")
+    parser.add_argument('--boards', type=int, default=256, help="Number of boards in the batch.")
+    parser.add_argument('--dimensions', type=int, default=8, help="Length and width of the board in spaces.")
+    parser.add_argument('--rows', type=int, default=3, help="Number of rows of pawns.")
+    parser.add_argument('--plies', type=int, default=100, help="Plies of random play to check or time.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the random moves.")
+    arguments = parser.parse_args()
+
+    mismatches = verify(min(arguments.boards, 64), arguments.dimensions, arguments.rows, arguments.plies,
+                        arguments.seed)
+    print(f'[BATCH VERIFIED] mismatches against the scalar rules: {mismatches}')
+
+    # Time random play of the whole batch against the same number of positions played one at a time.
+    generator = np.random.default_rng(arguments.seed)
+    batch = BoardBatch.starting(arguments.boards, arguments.dimensions, arguments.rows)
+    start_time = perf_counter()
+    positions = 0
+    for ply in range(arguments.plies):
+        active = batch.results() == NO_WIN
+        if not active.any():
+            break
+        batch = batch.select(active)  # Only the games still going are played on.
+        positions += int(batch.play_random(generator).sum())
+    batch_rate = positions / (perf_counter() - start_time)
+
+    boards = [Bitboard.starting(arguments.dimensions, arguments.rows) for board in range(arguments.boards)]
+    colors = [BLACK] * arguments.boards
+    start_time = perf_counter()
+    positions = 0
+    for ply in range(arguments.plies):
+        for index, board in enumerate(boards):
+            moves = generate_moves(board, colors[index])
+            if moves:
+                board.apply(moves[generator.integers(len(moves))])
+                colors[index] = RED if colors[index] == BLACK else BLACK
+                positions += 1
+    scalar_rate = positions / (perf_counter() - start_time)
+    print(f'[BATCH BENCHMARK] batched: {batch_rate:.0f} moves/s, scalar: {scalar_rate:.0f} moves/s')
+
+
+if __name__ == '__main__':
+    main()
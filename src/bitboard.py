@@ -0,0 +1,336 @@
+"""Bitboard representation of a checkers position that does not depend on pygame."""
+from random import Random
+
+# Constants for the pawn identifiers (shared with CheckeredBoard).
+EMPTY = 0
+RED_PAWN = 1
+BLACK_PAWN = 2
+RED_KING = 3
+BLACK_KING = 4
+PIECES = (RED_PAWN, BLACK_PAWN, RED_KING, BLACK_KING)
+
+# Constants for the colors, a pawn's color is its identifier modulo 2 (black pawns are even ints while red are odds).
+BLACK = 0
+RED = 1
+
+# Fixed seed for the Zobrist keys so hashes are the same in every process and every run.
+ZOBRIST_SEED = 0x5EED
+GEOMETRY_CACHE = {}
+ZOBRIST_CACHE = {}
+
+
+def geometry(dimensions: int) -> dict:
+    """Returns the shift amounts and edge masks for a board size, computed once per size and then cached."""
+    if dimensions not in GEOMETRY_CACHE:
+        full = (1 << (dimensions * dimensions)) - 1
+        columns = [0] * dimensions  # Mask of every square in each column.
+        for row in range(dimensions):
+            for col in range(dimensions):
+                columns[col] |= 1 << (row * dimensions + col)
+
+        # Masks of the squares a piece can step or jump from without wrapping around the left or right edge.
+        step_left = full & ~columns[0]
+        step_right = full & ~columns[-1]
+        jump_left = step_left & ~columns[1]
+        jump_right = step_right & ~columns[-2]
+
+        # Each direction is (shift, step source mask, jump source mask), negative shifts move up the board.
+        up = [(-(dimensions + 1), step_left, jump_left), (-(dimensions - 1), step_right, jump_right)]
+        down = [(dimensions + 1, step_right, jump_right), (dimensions - 1, step_left, jump_left)]
+
+        GEOMETRY_CACHE[dimensions] = {
+            'full': full,
+            'directions': {
+                BLACK_PAWN: up,  # Black moves forward up the board (decreasing row).
+                RED_PAWN: down,  # Red moves forward down the board (increasing row).
+                BLACK_KING: up + down,
+                RED_KING: up + down,
+            },
+            'promotion': {  # Rows that promote a pawn of each color into a king.
+                BLACK: sum(1 << col for col in range(dimensions)),
+                RED: sum(1 << ((dimensions - 1) * dimensions + col) for col in range(dimensions)),
+            },
+        }
+    return GEOMETRY_CACHE[dimensions]
+
+
+def zobrist(dimensions: int) -> dict:
+    """Returns the random 64 bit Zobrist keys for a board size, one per pawn type and square plus one for red to
+    move, generated once per size from a fixed seed."""
+    if dimensions not in ZOBRIST_CACHE:
+        generator = Random(ZOBRIST_SEED + dimensions)
+        ZOBRIST_CACHE[dimensions] = {
+            'pieces': [[generator.getrandbits(64) for square in range(dimensions * dimensions)]
+                       if pawn_id else None for pawn_id in range(len(PIECES) + 1)],
+            'side': generator.getrandbits(64),
+        }
+    return ZOBRIST_CACHE[dimensions]
+
+
+def shift(mask: int, amount: int, full: int) -> int:
+    """Shifts a mask by a signed amount of squares, dropping any bits that fall off the board."""
+    if amount > 0:
+        return (mask << amount) & full
+    return mask >> -amount
+
+
+def squares(mask: int):
+    """Yields the square index of every bit set in mask from lowest to highest."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class Bitboard:
+    """
+    A checkers position stored as one integer mask per pawn type. Square (row, col) is bit row * dimensions + col.
+
+    Parameters:
+        dimensions: Length and width of the board in spaces.
+
+    Keyword Arguments:
+        masks: Masks indexed by pawn identifier, index EMPTY is unused.
+        hash_value: Zobrist hash of masks if already known, otherwise it is computed from the masks.
+        counts: Number of pawns of each type in masks if already known, otherwise they are counted from the masks.
+
+    Attributes:
+        masks: A list of five integers, where masks[pawn_id] has a bit set for every square holding that pawn type.
+            Iterating a mask with squares() gives the piece list of that pawn type.
+        hash: Zobrist hash of the pawns on the board, updated incrementally as pawns are placed and removed.
+        counts: Number of pawns of each type indexed like masks, updated incrementally along with the hash.
+    """
+
+    __slots__ = ('dimensions', 'masks', 'hash', 'keys', 'counts', 'mobility_cache')
+
+    def __init__(self, dimensions: int, masks: list[int] = None, hash_value: int = None, counts: list[int] = None):
+        self.dimensions = dimensions
+        self.masks = list(masks) if masks else [0, 0, 0, 0, 0]
+        self.keys = zobrist(dimensions)['pieces']
+        if hash_value is None:  # Hash the position from scratch.
+            hash_value = 0
+            for pawn_id in PIECES:
+                for square in squares(self.masks[pawn_id]):
+                    hash_value ^= self.keys[pawn_id][square]
+        self.hash = hash_value
+        self.counts = list(counts) if counts else [mask.bit_count() for mask in self.masks]
+        self.mobility_cache = [None, None]  # Mobility of each color, computed on demand until the position changes.
+
+    @classmethod
+    def starting(cls, dimensions: int, rows: int) -> 'Bitboard':
+        """Returns the starting layout with rows of red pawns at the top and black pawns at the bottom."""
+        board = cls(dimensions)
+        for col in range(dimensions // 2):
+            for row in range(rows):
+                board.set(row, (col * 2) + (row % 2), RED_PAWN)
+                row = dimensions - (row + 1)
+                board.set(row, (col * 2) + (row % 2), BLACK_PAWN)
+        return board
+
+    @classmethod
+    def from_grid(cls, grid: list[list[int]]) -> 'Bitboard':
+        """Builds a bitboard from a list of rows of pawn identifiers."""
+        board = cls(len(grid))
+        for row, line in enumerate(grid):
+            for col, pawn_id in enumerate(line):
+                if pawn_id:
+                    board.set(row, col, pawn_id)
+        return board
+
+    def to_grid(self) -> list[list[int]]:
+        """Returns the position as a list of rows of pawn identifiers."""
+        grid = [[EMPTY for x in range(self.dimensions)] for y in range(self.dimensions)]
+        for pawn_id in PIECES:
+            for square in squares(self.masks[pawn_id]):
+                row, col = divmod(square, self.dimensions)
+                grid[row][col] = pawn_id
+        return grid
+
+    def copy(self) -> 'Bitboard':
+        """Returns an independent copy of the position."""
+        return Bitboard(self.dimensions, self.masks, self.hash, self.counts)
+
+    def restore(self, other: 'Bitboard') -> None:
+        """Overwrites this position with the contents of other."""
+        self.masks = list(other.masks)
+        self.hash = other.hash
+        self.counts = list(other.counts)
+        self.mobility_cache = list(other.mobility_cache)
+
+    def get(self, row: int, col: int) -> int:
+        """Returns the pawn identifier on (row, col)."""
+        return self.get_square(row * self.dimensions + col)
+
+    def get_square(self, square: int) -> int:
+        """Returns the pawn identifier on the square index."""
+        bit = 1 << square
+        for pawn_id in PIECES:
+            if self.masks[pawn_id] & bit:
+                return pawn_id
+        return EMPTY
+
+    def set(self, row: int, col: int, pawn_id: int) -> None:
+        """Places pawn_id on (row, col), replacing whatever was there."""
+        self.set_square(row * self.dimensions + col, pawn_id)
+
+    def set_square(self, square: int, pawn_id: int) -> None:
+        """Places pawn_id on the square index, replacing whatever was there."""
+        bit = 1 << square
+        for other in PIECES:
+            if self.masks[other] & bit:
+                self.masks[other] ^= bit
+                self.hash ^= self.keys[other][square]
+                self.counts[other] -= 1
+        if pawn_id:
+            self.masks[pawn_id] |= bit
+            self.hash ^= self.keys[pawn_id][square]
+            self.counts[pawn_id] += 1
+        self.mobility_cache = [None, None]
+
+    def key(self, color: int) -> int:
+        """Returns the Zobrist hash of the position with color to move."""
+        return self.hash ^ zobrist(self.dimensions)['side'] if color == RED else self.hash
+
+    def pieces(self, color: int) -> int:
+        """Returns the mask of every pawn and king of the color."""
+        pawn_id = BLACK_PAWN if color == BLACK else RED_PAWN
+        return self.masks[pawn_id] | self.masks[pawn_id + 2]
+
+    def count(self, color: int) -> int:
+        """Returns the number of pawns and kings of the color."""
+        pawn_id = BLACK_PAWN if color == BLACK else RED_PAWN
+        return self.counts[pawn_id] + self.counts[pawn_id + 2]
+
+    def total(self) -> int:
+        """Returns the number of pawns and kings on the board."""
+        return self.counts[RED_PAWN] + self.counts[BLACK_PAWN] + self.counts[RED_KING] + self.counts[BLACK_KING]
+
+    def mobility(self, color: int) -> tuple[int, int]:
+        """Returns the number of single steps and single jumps the color can make, ignoring that jumps are forced.
+        Counted with one shift per direction and cached until the position changes."""
+        if self.mobility_cache[color] is None:
+            info = geometry(self.dimensions)
+            empty = info['full'] & ~self.occupied()
+            opponents = self.pieces(1 - color)
+            steps = jumps = 0
+            for pawn_id in ((BLACK_PAWN, BLACK_KING) if color == BLACK else (RED_PAWN, RED_KING)):
+                movers = self.masks[pawn_id]
+                if movers:
+                    for amount, step_mask, jump_mask in info['directions'][pawn_id]:
+                        steps += (shift(movers & step_mask, amount, info['full']) & empty).bit_count()
+                        over = shift(movers & jump_mask, amount, info['full']) & opponents
+                        jumps += (shift(over, amount, info['full']) & empty).bit_count()
+            self.mobility_cache[color] = (steps, jumps)
+        return self.mobility_cache[color]
+
+    def occupied(self) -> int:
+        """Returns the mask of every occupied square."""
+        return self.masks[RED_PAWN] | self.masks[BLACK_PAWN] | self.masks[RED_KING] | self.masks[BLACK_KING]
+
+    def empty(self) -> int:
+        """Returns the mask of every empty square."""
+        return geometry(self.dimensions)['full'] & ~self.occupied()
+
+    def steps(self, sources: int) -> list[tuple[int, int]]:
+        """Returns every (from, to) square pair for single steps of the pawns in the sources mask."""
+        info = geometry(self.dimensions)
+        empty = info['full'] & ~self.occupied()
+        moves = []
+        for pawn_id in PIECES:
+            movers = sources & self.masks[pawn_id]
+            if movers:
+                for amount, step_mask, jump_mask in info['directions'][pawn_id]:
+                    for target in squares(shift(movers & step_mask, amount, info['full']) & empty):
+                        moves.append((target - amount, target))
+        return moves
+
+    def jumps(self, sources: int) -> list[tuple[int, int, int]]:
+        """Returns every (from, over, to) square triple for single jumps of the pawns in the sources mask."""
+        info = geometry(self.dimensions)
+        empty = info['full'] & ~self.occupied()
+        moves = []
+        for pawn_id in PIECES:
+            movers = sources & self.masks[pawn_id]
+            if movers:
+                opponents = self.pieces((pawn_id + 1) % 2)
+                for amount, step_mask, jump_mask in info['directions'][pawn_id]:
+                    over = shift(movers & jump_mask, amount, info['full']) & opponents
+                    for target in squares(shift(over, amount, info['full']) & empty):
+                        moves.append((target - 2 * amount, target - amount, target))
+        return moves
+
+    def move_square(self, start: int, end: int) -> bool:
+        """Moves the pawn on start to end, removing any jumped pawn and promoting it on the far row. Returns whether
+        the move was a jump."""
+        pawn_id = self.get_square(start)
+        self.masks[pawn_id] ^= 1 << start
+        self.hash ^= self.keys[pawn_id][start]
+        jumped = abs(end // self.dimensions - start // self.dimensions) > 1
+        if jumped:  # Remove the pawn being jumped.
+            self.set_square((start + end) // 2, EMPTY)
+        if pawn_id < RED_KING and (1 << end) & geometry(self.dimensions)['promotion'][pawn_id % 2]:
+            self.counts[pawn_id] -= 1
+            pawn_id += 2
+            self.counts[pawn_id] += 1
+        self.masks[pawn_id] |= 1 << end
+        self.hash ^= self.keys[pawn_id][end]
+        self.mobility_cache = [None, None]
+        return jumped
+
+    def apply(self, move) -> None:
+        """Plays a whole move (see movegen.Move), removing every captured pawn and promoting the pawn if needed."""
+        self.make(move)
+
+    def make(self, move) -> tuple[int, ...]:
+        """Plays a whole move like apply and returns the identifiers of the captured pawns, which unmake needs to
+        take the move back."""
+        masks, counts, keys = self.masks, self.counts, self.keys
+        start = move.path[0]
+        end = move.path[-1]
+        pawn_id = self.get_square(start)
+        masks[pawn_id] ^= 1 << start
+        self.hash ^= keys[pawn_id][start]
+
+        captured = []
+        for square in move.captures:
+            other = self.get_square(square)
+            masks[other] ^= 1 << square
+            self.hash ^= keys[other][square]
+            counts[other] -= 1
+            captured.append(other)
+
+        if move.promotes:
+            counts[pawn_id] -= 1
+            pawn_id += 2
+            counts[pawn_id] += 1
+        masks[pawn_id] |= 1 << end
+        self.hash ^= keys[pawn_id][end]
+        self.mobility_cache = [None, None]
+        return tuple(captured)
+
+    def unmake(self, move, captured: tuple[int, ...]) -> None:
+        """Takes back a move played with make, given the captured pawns make returned."""
+        masks, counts, keys = self.masks, self.counts, self.keys
+        start = move.path[0]
+        end = move.path[-1]
+        pawn_id = self.get_square(end)
+        masks[pawn_id] ^= 1 << end
+        self.hash ^= keys[pawn_id][end]
+        if move.promotes:
+            counts[pawn_id] -= 1
+            pawn_id -= 2
+            counts[pawn_id] += 1
+        masks[pawn_id] |= 1 << start
+        self.hash ^= keys[pawn_id][start]
+
+        for square, other in zip(move.captures, captured):
+            masks[other] |= 1 << square
+            self.hash ^= keys[other][square]
+            counts[other] += 1
+        self.mobility_cache = [None, None]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Bitboard) and self.dimensions == other.dimensions and self.masks == other.masks
+
+    def __hash__(self) -> int:
+        return self.hash
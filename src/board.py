@@ -1,19 +1,33 @@
-from copy import deepcopy
 from math import floor
-from random import seed, choice, shuffle
+from random import seed
 
-from pygame import Surface, draw, Rect, transform, MOUSEBUTTONDOWN, mouse
+from pygame import Surface, draw, Rect, MOUSEBUTTONDOWN, mouse
 from pygame.event import Event, post
 
 from asset import Asset
+import bitboard
+import game
+from bitboard import PIECES, squares
+from book import open_book
 from colors import *
 from config import *
-from filepaths import RED_PAWN_ICON, BLACK_PAWN_ICON, RED_KING_ICON, BLACK_KING_ICON
+from cpu import CPUPlayer
+from evaluation import load_evaluation
+from filepaths import RED_PAWN_ICON, BLACK_PAWN_ICON, RED_KING_ICON, BLACK_KING_ICON, TABLEBASE_FILE, \
+    OPENING_BOOK_FILE, EVALUATION_FILE
+from game import Game
+from images import IMAGES
+from label import Label
 from network import Client
+from parallel import ParallelEngine
+from protocol import EngineProcess
+from search import Engine
+from tablebase import open_tablebase
 
 class CheckeredBoard(Asset):
     """
-    Game board that handles the bulk of the game logic.
+    Game board that draws a Game and turns the user's input and the CPU's and opponent's moves into turns played on
+    it. The rules themselves live in the pygame-free Game.
 
     Parameters:
         board_dimensions: Length and width of the board in spaces.
@@ -21,6 +35,7 @@ class CheckeredBoard(Asset):
         mode: Constant representing the state of type of game being played.
 
     Keyword Arguments:
+        difficulty: Constant for the CPU difficulty level that sets the search budget when playing against the CPU.
         position: Position of the top-left corner of the game board.
         vertical_padding: Distance between the top of the screen and the start of the border of the board.
     """
@@ -29,77 +44,83 @@ class CheckeredBoard(Asset):
     BORDER_THICK = 10
     BORDER_COLOR = BLACK
     PAWN_SCALE_FACTOR: float = 0.9
+    THINKING_MARGIN = 40  # Distance between the board and the CPU's thinking label.
 
     # Constants for the pawn identifiers.
-    EMPTY = 0
-    RED_PAWN = 1
-    BLACK_PAWN = 2
-    RED_KING = 3
-    BLACK_KING = 4
+    EMPTY = bitboard.EMPTY
+    RED_PAWN = bitboard.RED_PAWN
+    BLACK_PAWN = bitboard.BLACK_PAWN
+    RED_KING = bitboard.RED_KING
+    BLACK_KING = bitboard.BLACK_KING
 
     # Constants for tracking the player's turns.
     BLACK_TURN = 0
     RED_TURN = 1
 
     # Constants for tracking who wins the game.
-    BLACK_WIN = 1
-    RED_WIN = 2
-    NO_WIN = 0
+    BLACK_WIN = game.BLACK_WIN
+    RED_WIN = game.RED_WIN
+    NO_WIN = game.NO_WIN
 
     def __init__(self, board_dimensions: int,
                  rows: int,
                  mode: int,
                  client: Client = None,
+                 difficulty: int = CPU_NORMAL,
                  position: Vector2 = Vector2(0, 0),
                  vertical_padding: int = 10):
 
         super().__init__(position)
-        self.square_size = (SCREEN_HEIGHT - (vertical_padding + CheckeredBoard.BORDER_THICK * 2)) / board_dimensions
         self.dimensions = board_dimensions
         self.selected_pawn: Vector2 = CheckeredBoard.EMPTY
-        self.jumped = False
         self.mode = mode
         self.client = client
 
-        self.pawns = [[CheckeredBoard.EMPTY for x in range(board_dimensions)] for y in range(board_dimensions)]
-        for col in range(self.dimensions // 2):
-            for row in range(rows):
-                self.pawns[row][(col * 2) + (row % 2)] = CheckeredBoard.RED_PAWN
-                row = self.dimensions - (row + 1)
-                self.pawns[row][(col * 2) + (row % 2)] = CheckeredBoard.BLACK_PAWN
+        self.game = Game(board_dimensions, rows)  # Keeps the position and the rules.
 
-        self.pawn_size = int(self.square_size * CheckeredBoard.PAWN_SCALE_FACTOR)
         self.empty_icon = Surface((0, 0))
-
-        self.icons = {
-            CheckeredBoard.EMPTY: Surface((0, 0)),
-            CheckeredBoard.RED_PAWN: transform.scale(RED_PAWN_ICON, (self.pawn_size, self.pawn_size)),
-            CheckeredBoard.BLACK_PAWN: transform.scale(BLACK_PAWN_ICON, (self.pawn_size, self.pawn_size)),
-            CheckeredBoard.RED_KING: transform.scale(RED_KING_ICON, (self.pawn_size, self.pawn_size)),
-            CheckeredBoard.BLACK_KING: transform.scale(BLACK_KING_ICON, (self.pawn_size, self.pawn_size)),
-        }
-
-        self.board_size_pixels = int(board_dimensions * self.square_size + (CheckeredBoard.BORDER_THICK * 2))
-        self.background = Surface((self.board_size_pixels, self.board_size_pixels))
-        self.background.fill(CheckeredBoard.BORDER_COLOR)
-        self.width = self.background.get_width()
-        self.height = self.background.get_height()
-        self.moves = None
+        self.moves: set[tuple[int, int]] = set()  # Squares the selected pawn can hop to.
+        self.highlights: list[Vector2] = []  # Screen positions of the highlight circles of self.moves.
         self.moved = False
         self.moved_pawn = None
-        self.turn = CheckeredBoard.BLACK_TURN
-        self.saved_state: list[list[int]] = deepcopy(self.pawns)
-        self.square_anchor = self.position + Vector2(CheckeredBoard.BORDER_THICK, CheckeredBoard.BORDER_THICK)
+        self.thinking_label = None
+
+        # The border and squares are drawn once into self.background, the pawns into self.layer whenever they move.
+        self.layer: Surface = None
+        self.layer_key: tuple = None  # Position hash and selected pawn self.layer was drawn for.
+        self.frame: tuple = None  # Layer key, position, dragged pawn area and thinking state of the frame to draw.
+        self.drawn: tuple = None  # The same for the last frame drawn.
+        self.resize(SCREEN_HEIGHT - vertical_padding)
 
         self.processing = not (mode == LAN_JOIN)
 
+        self.cpu = None
         if mode == LOCAL_CPU:
             seed()  # Seed the random number generator if playing against a CPU.
+            tablebase_path = TABLEBASE_FILE.format(dimensions=board_dimensions)
+            evaluation_path = EVALUATION_FILE.format(dimensions=board_dimensions)
+            book = open_book(OPENING_BOOK_FILE.format(dimensions=board_dimensions))
+            if CPU_ENGINE_PROCESS:  # Launched once here and reused for every CPU turn of the game.
+                self.cpu = CPUPlayer(EngineProcess(command=CPU_ENGINE_COMMAND, tablebase_path=tablebase_path,
+                                                   evaluation_path=evaluation_path,
+                                                   **CPU_SEARCH_LIMITS[difficulty]), book)
+            elif CPU_WORKERS > 1:
+                self.cpu = CPUPlayer(ParallelEngine(workers=CPU_WORKERS, tablebase_path=tablebase_path,
+                                                    evaluation_path=evaluation_path,
+                                                    **CPU_SEARCH_LIMITS[difficulty]), book)
+            else:
+                self.cpu = CPUPlayer(Engine(tablebase=open_tablebase(tablebase_path),
+                                            evaluation=load_evaluation(evaluation_path),
+                                            **CPU_SEARCH_LIMITS[difficulty]), book)
+            self.thinking_label = Label(text="Thinking...", font_size=60, font_color=LIGHT_BLUE,
+                                        border_color=LIGHT_BLUE)
+            self.set_pos(self.position)
 
     def add_wood_texture(self):
         wood_texture = pygame.image.load("wood_texture.png")  # Replace "wood_texture.png" with the actual file path of the wood texture image
         wood_texture = pygame.transform.scale(wood_texture, (self.board_size_pixels, self.board_size_pixels))
         self.background.blit(wood_texture, (0, 0))
+        self.layer = None  # Redraw the pawns over the new texture.
 
     def process(self, events: list[Event]) -> None:
         """Updates the checkered board's state with the event queue."""
@@ -114,24 +135,32 @@ class CheckeredBoard(Asset):
                         post(Event(BLACK_WINS))
                     else:
                         post(Event(RED_WINS))
-                elif BOARD_STATE_MESSAGE in e.message:
-                    board_state = e.message.split(',')[1]
-                    post(Event(TURN_ENDED, board_state=board_state))
+                elif e.message.startswith(MOVE_MESSAGE):  # The opponent sent the path of their move.
+                    try:
+                        path = tuple(map(int, e.message.split(',')[1:]))
+                    except ValueError:
+                        path = None
+                    move = self.game.move_paths.get(path)
+                    if move:
+                        self.game.play_move(move)
+                        post(Event(TURN_ENDED))
+                    else:
+                        post(Event(NETWORK_ERROR, message="Received an illegal move."))
 
             elif e.type == TURN_CANCELED:
                 self.selected_pawn = CheckeredBoard.EMPTY
-                self.moves = None
+                self.set_moves(set())
                 self.moved = False
-                self.jumped = False
-                self.pawns = deepcopy(self.saved_state)
+                self.game.cancel_turn()
+                if self.pondering_enabled():  # Restart pondering cleanly from the restored position.
+                    self.cpu.ponder(self.game.bitboard, self.turn)
 
             elif e.type == TURN_ENDED:
                 self.selected_pawn = CheckeredBoard.EMPTY
-                self.moves = None
+                self.set_moves(set())
                 self.moved = False
-                self.jumped = False
-                self.saved_state = deepcopy(self.pawns)
-                self.turn = (self.turn + 1) % 2  # Swap the turn counter.
+                path = self.game.path  # The turn's move, sent to an online opponent.
+                self.game.end_turn()  # Swap the turn counter.
 
                 # User just finished their turn against the local CPU.
                 if self.turn == CheckeredBoard.RED_TURN and self.mode == LOCAL_CPU:
@@ -146,31 +175,30 @@ class CheckeredBoard(Asset):
                 elif (self.mode == LAN_HOST and self.turn == CheckeredBoard.RED_TURN) or \
                         (self.mode == LAN_JOIN and self.turn == CheckeredBoard.BLACK_TURN):
                     self.processing = False
-                    message = f'{BOARD_STATE_MESSAGE},'
-                    for row in range(self.dimensions):
-                        for col in range(self.dimensions):
-                            message += str(self.pawns[row][col])
+                    # Send the move rather than the whole board, so the message grows with the move, not the board.
+                    message = f'{MOVE_MESSAGE},' + ','.join(map(str, path))
                     try:
-                        self.client.send(message)  # Send the board state over to the other person.
+                        self.client.send(message)
                     except Exception:
-                        post(Event(NETWORK_ERROR, message="Error while sending the board state."))
+                        post(Event(NETWORK_ERROR, message="Error while sending the move."))
 
-                # The game is online and the opponent just finished their turn.
+                # The game is online and the opponent just finished their turn, their move was already played.
                 elif (self.mode == LAN_HOST and self.turn == CheckeredBoard.BLACK_TURN) or \
                         (self.mode == LAN_JOIN and self.turn == CheckeredBoard.RED_TURN):
-                    # Set the board using the board state of the event's message.
-                    for row in range(self.dimensions):
-                        for col in range(self.dimensions):
-                            self.pawns[row][col] = int(e.board_state[int(col) + (int(row) * self.dimensions)])
-
                     self.processing = True  # It is now the user's turn.
 
                 self.check_for_win()
 
+                # Search the CPU's answers while the user decides on their move.
+                if self.pondering_enabled():
+                    self.cpu.ponder(self.game.bitboard, self.turn)
+
             elif e.type == BUTTON_PRESSED:
                 if e.text == "End Turn":
                     post(Event(TURN_ENDED))
                 elif e.text == "Forfeit":
+                    if self.cpu:  # Stop the CPU from finishing a move after the game is over.
+                        self.cpu.cancel()
                     if self.mode == LAN_HOST:
                         post(Event(RED_WINS))
                         try:
@@ -187,6 +215,8 @@ class CheckeredBoard(Asset):
                         post(Event(BLACK_WINS))
                     else:
                         post(Event(RED_WINS))
+                elif e.text == "Return" and self.cpu:  # The user is leaving to the menu.
+                    self.cpu.close()
 
             elif e.type == MOUSEBUTTONDOWN and self.processing:
                 mouse_pos = Vector2(mouse.get_pos())
@@ -197,201 +227,210 @@ class CheckeredBoard(Asset):
                     if mouse.get_pressed(3)[2]:  # If the user right clicks, cancel the move and reset the turn.
                         event.post(event.Event(TURN_CANCELED))
                     elif self.selected_pawn:  # User already has a pawn selected and attempts to move it.
-                        if Vector2(mouse_row, mouse_col) in self.moves:  # The move is valid, move the pawn.
-                            # Save the state of the board before the initial move in case the turn is canceled.
-                            if not self.moved:
-                                self.saved_state = deepcopy(self.pawns)
-
-                            self.move_pawn((mouse_row, mouse_col))
-                            post(Event(TURN_ENDED))
-
+                        if (mouse_row, mouse_col) in self.moves:  # The move is valid, move the pawn.
+                            # End the turn once the path is a whole legal move, otherwise the capture chain continues.
+                            if self.move_pawn((mouse_row, mouse_col)):
+                                post(Event(TURN_ENDED))
+                            else:
+                                self.selected_pawn = self.moved_pawn
+                                self.set_moves(self.calculate_moves())
 
                         # Return the selected pawn if the same location was selected (no attempted movement).
-                        elif Vector2(mouse_row, mouse_col) == self.selected_pawn:
+                        elif (mouse_row, mouse_col) == self.selected_pawn:
                             self.selected_pawn = CheckeredBoard.EMPTY
 
                         else:  # Otherwise, invalid move, cancel the turn.
                             event.post(event.Event(TURN_CANCELED))
 
                     # Check if the user selects a pawn they control (black pawns are even ints while red are odds).
-                    elif self.pawns[mouse_row][mouse_col] and self.pawns[mouse_row][mouse_col] % 2 == self.turn:
+                    elif self.get_pawn_id(mouse_row, mouse_col) and \
+                            self.get_pawn_id(mouse_row, mouse_col) % 2 == self.turn:
                         #  Make sure the user is not selecting a different pawn if a move is in progress (double jump).
                         if not self.moved or (self.moved and (mouse_row, mouse_col) == self.moved_pawn):
                             self.selected_pawn = (mouse_row, mouse_col)
-                            self.moves = self.calculate_moves()
+                            self.set_moves(self.calculate_moves())
 
-            # CPU makes a move in place of a human player.
+            # CPU makes a move in place of a human player, searching on a worker thread within the difficulty's budget.
             elif e.type == CPU_TURN:
-                open_moves = []
-                # Iterate through all the pawns on the board to look for a good move.
-                for row in range(self.dimensions):
-                    for col in range(self.dimensions):
-                        self.selected_pawn = (row, col)
-                        pawn_id = self.get_sel_pawn_id()
-                        if pawn_id == CheckeredBoard.RED_PAWN or pawn_id == CheckeredBoard.RED_KING:
-                            for move in self.calculate_moves():
-                                score = 0
-                                if move[0] == (self.dimensions - 1) and pawn_id == CheckeredBoard.RED_PAWN:
-                                    score += 1
-                                if abs(self.selected_pawn[0] - move[0]) == 2:
-                                    score += 1
-                                open_moves.append([self.selected_pawn, move, score])
-
-                if len(open_moves) == 0:  # CPU cannot move, user wins the game.
-                    post(Event(BLACK_WINS))
-                else:  # Otherwise, make a move.
-                    shuffle(open_moves)  # Randomize the move list for variation.
-                    # Select the best move (highest score) to make.
-                    best_move = open_moves[0]
-                    for move in open_moves:
-                        if move[2] > best_move[2]:  # Compare the scores of each move.
-                            best_move = move
-
-                    self.selected_pawn = best_move[0]
-                    self.move_pawn(best_move[1])
-                    self.selected_pawn = best_move[1]
-
-                    # Continue to double jump while the CPU has the option to do so.
-                    open_moves = self.calculate_moves()
-                    while len(open_moves) > 0:
-                        position = choice(open_moves)
-                        self.move_pawn(position)
-                        self.selected_pawn = position
-                        open_moves = self.calculate_moves()
+                self.selected_pawn = CheckeredBoard.EMPTY
+                self.cpu.start(self.game.bitboard, self.turn)
+
+            # The CPU finished searching, ignoring results from searches that were canceled.
+            elif e.type == CPU_MOVE_READY and self.cpu and e.search_id == self.cpu.search_id:
+                result = e.result
+                if CPU_DEBUG and e.book:
+                    print(f'[CPU BOOK MOVE] {result.move.path}')
+                elif CPU_DEBUG:
+                    print(f'[CPU SEARCHED] depth: {result.depth}, score: {result.score}, ponder hits: '
+                          f'{self.cpu.ponder_hits}, {self.cpu.engine.statistics()}')
+                if result.move:  # If the CPU cannot move, check_for_win already reported that the user won.
+                    self.game.play_move(result.move)
                     post(Event(TURN_ENDED))
 
-                self.selected_pawn = CheckeredBoard.EMPTY
 
 
+    @property
+    def turn(self) -> int:
+        """Color of the side to move, kept by the game."""
+        return self.game.turn
+
+    def pondering_enabled(self) -> bool:
+        """Returns whether the CPU should ponder now, i.e. the game goes on and it is the user's turn against it."""
+        return bool(self.cpu and CPU_PONDER and self.turn == CheckeredBoard.BLACK_TURN and
+                    self.game.result == CheckeredBoard.NO_WIN)
 
     def get_sel_pawn_id(self) -> int:
-        """Returns the ID of the pawn type for the pawn specified by self.selected_pawn in self.pawns."""
-        return self.pawns[int(self.selected_pawn[0])][int(self.selected_pawn[1])]
+        """Returns the ID of the pawn type for the pawn specified by self.selected_pawn in the game's bitboard."""
+        return self.game.bitboard.get(int(self.selected_pawn[0]), int(self.selected_pawn[1]))
 
     def get_pawn_id(self, row: int, col: int) -> int:
-        """Returns the ID of the pawn type for the pawn specified by (row, col) in self.pawns."""
-        return self.pawns[row][col]
+        """Returns the ID of the pawn type for the pawn specified by (row, col) in the game's bitboard."""
+        return self.game.bitboard.get(row, col)
 
     def set_pos(self, position: Vector2) -> None:
         """Sets the position of the checkered board's top-left corner to position."""
         self.position = position
         self.square_anchor = self.position + Vector2(CheckeredBoard.BORDER_THICK, CheckeredBoard.BORDER_THICK)
+        if self.thinking_label:  # Keep the thinking label to the left of the board, vertically centered.
+            x = position.x - self.thinking_label.get_width() - CheckeredBoard.THINKING_MARGIN
+            y = position.y + (self.height - self.thinking_label.get_height()) / 2
+            self.thinking_label.set_pos(Vector2(x, y))
+        self.set_moves(self.moves)  # Move the highlights along with the board.
 
     def center(self, position: Vector2) -> None:
         """Centers the board around position."""
         position = position - (Vector2(self.width, self.height) / 2)
         self.set_pos(position)
 
-    def move_pawn(self, position: tuple[int, int]) -> None:
-        """Function moves self.selected_pawn's position in self.pawns to the location specified its arguments."""
+    def move_pawn(self, position: tuple[int, int]) -> bool:
+        """Function moves self.selected_pawn's position in the game to the location specified its arguments. Returns
+        whether the pawn's path is now a whole legal move."""
         row = int(position[0])
         col = int(position[1])
 
-        if abs(row - self.selected_pawn[0]) > 1:  # Check if a jump is occurring.
-            # Calculate the location of the pawn that is being jumped.
-            y = int((row + self.selected_pawn[0]) / 2)
-            x = int((col + self.selected_pawn[1]) / 2)
-            self.pawns[y][x] = CheckeredBoard.EMPTY  # Remove the pawn being jumped.
-            self.jumped = True
-
-        # Promote the pawn if it isn't already a king and it is moving to the end of the board.
-        if row % (self.dimensions - 1) == 0 and self.get_sel_pawn_id() < 3:
-            self.pawns[self.selected_pawn[0]][self.selected_pawn[1]] += 2
-
-        # Move the pawn to its new location.
-        self.pawns[row][col] = self.get_sel_pawn_id()
-        # Set old location to empty.
-        self.pawns[self.selected_pawn[0]][self.selected_pawn[1]] = CheckeredBoard.EMPTY
+        # Move the pawn to its new location, removing any jumped pawn and promoting it at the end of the board.
+        start = int(self.selected_pawn[0]) * self.dimensions + int(self.selected_pawn[1])
+        finished = self.game.play_hop(start, row * self.dimensions + col)
         self.selected_pawn = CheckeredBoard.EMPTY
         self.moved_pawn = (row, col)  # Save the moved pawn for potential double jump.
         self.moved = True
+        return finished
+
+    def calculate_moves(self) -> set[tuple[int, int]]:
+        """Returns the set of (row, col) tuples that self.selected_pawn can hop to next, looked up from the game's
+        legal moves, which are indexed once per turn."""
+        start = int(self.selected_pawn[0]) * self.dimensions + int(self.selected_pawn[1])
+        return {divmod(square, self.dimensions) for square in self.game.next_hops(start)}
 
-    def calculate_moves(self) -> list[tuple[int, int]]:
-        """Returns a list of int tuples that represent the possible ending positions of self.selected_pawn."""
-        forwards = [Vector2(-1, -1), Vector2(-1, 1)]  # Forwards direction vectors from the perspective of black.
-        backwards = [Vector2(1, 1), Vector2(1, -1)]  # Backwards direction vectors from the perspective of black.
-
-        pawn_id = self.get_sel_pawn_id()
-        if pawn_id > 2:  # Check if the piece is a king as direction does not limit their movement.
-            directions = forwards + backwards
-        elif pawn_id == CheckeredBoard.BLACK_PAWN:  # Check if black is moving.
-            directions = forwards
-        else:  # Otherwise, it is red's turn (reversed forward direction).
-            directions = backwards
-
-        open_adj_spaces = []
-        open_jump_spaces = []
-        for direction in directions:
-            # Calculate the row and column of the space to check.
-            row = int(self.selected_pawn[0] + direction[0])
-            col = int(self.selected_pawn[1] + direction[1])
-
-            # Check if the space is empty first.
-            if 0 <= row < self.dimensions and 0 <= col < self.dimensions:  # Check if the space is on the board.
-                pawn_id = self.get_pawn_id(row, col)
-                if pawn_id == CheckeredBoard.EMPTY:
-                    open_adj_spaces.append(Vector2(row, col))
-
-                elif self.get_sel_pawn_id() != pawn_id != (self.get_sel_pawn_id() + 2):
-                    row += int(direction[0])
-                    col += int(direction[1])
-                    if 0 <= row < self.dimensions and 0 <= col < self.dimensions:  # Check if the space is on the board.
-                        pawn_id = self.get_pawn_id(row, col)
-                        if pawn_id == CheckeredBoard.EMPTY:
-                            open_jump_spaces.append((int(row), int(col)))
-
-        if self.jumped:  # If the pawn has already jumped this turn, they can only make more jumps during this turn.
-            open_moves = open_jump_spaces
-        elif not self.moved:  # Otherwise, if this is the initial move, both types of moves are open.
-            open_moves = open_jump_spaces + open_adj_spaces
-        else:  # Otherwise, the pawn has already moved to an adjacent space and cannot move anymore.
-            open_moves = []
-        return open_moves
+    def set_moves(self, moves: set[tuple[int, int]]) -> None:
+        """Sets the squares the selected pawn can hop to and the screen positions of their highlights, the centers of
+        those squares."""
+        self.moves = moves
+        self.highlights = [self.square_anchor + Vector2(col + 0.5, row + 0.5) * self.square_size
+                           for row, col in sorted(moves)]
 
     def check_for_win(self) -> None:
-        """Checks the board to see if either player has won the game. Wins are signaled with posting an event on
-        the event queue."""
-        black_exists = False
-        red_exists = False
+        """Checks the game to see if either player has won. Wins are signaled with posting an event on the event
+        queue."""
+        if self.game.result == CheckeredBoard.BLACK_WIN:
+            post(Event(BLACK_WINS))
+        elif self.game.result == CheckeredBoard.RED_WIN:
+            post(Event(RED_WINS))
 
+    def resize(self, height: float) -> None:
+        """Sizes the board to height pixels, scaling the pawn icons and redrawing the static layer of the border and
+        squares."""
+        self.square_size = (height - CheckeredBoard.BORDER_THICK * 2) / self.dimensions
+        self.pawn_size = int(self.square_size * CheckeredBoard.PAWN_SCALE_FACTOR)
+        size = (self.pawn_size, self.pawn_size)  # Shared with every board of the same size through the cache.
+        self.icons = {
+            CheckeredBoard.EMPTY: Surface((0, 0)),
+            CheckeredBoard.RED_PAWN: IMAGES.get(RED_PAWN_ICON, size),
+            CheckeredBoard.BLACK_PAWN: IMAGES.get(BLACK_PAWN_ICON, size),
+            CheckeredBoard.RED_KING: IMAGES.get(RED_KING_ICON, size),
+            CheckeredBoard.BLACK_KING: IMAGES.get(BLACK_KING_ICON, size),
+        }
+
+        self.board_size_pixels = int(self.dimensions * self.square_size + (CheckeredBoard.BORDER_THICK * 2))
+        self.background = Surface((self.board_size_pixels, self.board_size_pixels))
+        self.background.fill(CheckeredBoard.BORDER_COLOR)
         for row in range(self.dimensions):
             for col in range(self.dimensions):
-                pawn_id = self.get_pawn_id(row, col)
-                if pawn_id == CheckeredBoard.BLACK_PAWN or pawn_id == CheckeredBoard.BLACK_KING:
-                    black_exists = True
-                elif pawn_id == CheckeredBoard.RED_PAWN or pawn_id == CheckeredBoard.RED_KING:
-                    red_exists = True
-
-        # Post the appropriate event if a player won the game.
-        if not black_exists:
-            post(Event(RED_WINS))
-        elif not red_exists:
-            post(Event(BLACK_WINS))
+                color = LIGHTBROWN if (col + row) % 2 else DARKBROWN
+                position = (CheckeredBoard.BORDER_THICK + col * self.square_size,
+                            CheckeredBoard.BORDER_THICK + row * self.square_size)
+                draw.rect(self.background, color, Rect(position, (self.square_size, self.square_size)))
+        self.width = self.background.get_width()
+        self.height = self.background.get_height()
+        self.layer = None
+        self.set_pos(self.position)  # Lay the highlights and the thinking label out for the new size.
+
+    def board_layer(self) -> Surface:
+        """Returns the static layer with the still pawns drawn on it, redrawn only after a move, a canceled turn, a
+        received move or a change of the selected pawn, which is drawn at the mouse cursor instead."""
+        key = (self.game.bitboard.hash, self.selected_pawn)
+        if self.layer is None or self.layer_key != key:
+            self.layer = self.background.copy()
+            masks = self.game.bitboard.masks
+            offset = CheckeredBoard.BORDER_THICK + (self.square_size - self.pawn_size) / 2  # Center the icons.
+            # Visit only the occupied squares, so the cost grows with the pawns, not the board's area.
+            for pawn_id in PIECES:
+                icon = self.icons[pawn_id]
+                for square in squares(masks[pawn_id]):
+                    row, col = divmod(square, self.dimensions)
+                    if (row, col) != self.selected_pawn:
+                        self.layer.blit(icon, (col * self.square_size + offset, row * self.square_size + offset))
+            self.layer_key = key
+        return self.layer
+
+    def drag_rect(self) -> Rect:
+        """Returns the area of the selected pawn drawn at the mouse cursor, or None if no pawn is selected."""
+        if not self.selected_pawn:
+            return None
+        return Rect(Vector2(mouse.get_pos()) - Vector2(self.square_size, self.square_size) / 2,
+                    (self.pawn_size, self.pawn_size))
+
+    def frame_state(self) -> tuple:
+        """Returns everything that decides how the board looks in the next frame."""
+        return ((self.game.bitboard.hash, self.selected_pawn), tuple(self.position), self.drag_rect(),
+                bool(self.cpu and self.cpu.is_thinking()))
+
+    def dirty_rects(self) -> list[Rect]:
+        """Returns the areas the board changed since it was last drawn: the whole board once its pawns or position
+        change, otherwise only the path of the dragged pawn and the thinking label as it shows and hides."""
+        rects = super().dirty_rects()
+        # The state is fixed here for the frame, the CPU may start or stop thinking before the board is drawn.
+        state = self.frame = self.frame_state()
+        if self.drawn is None:
+            return rects + [Rect(self.position, (self.width, self.height))]
+        layer_key, position, drag_rect, thinking = self.drawn
+        if (layer_key, position) != state[:2]:
+            rects += [Rect(position, (self.width, self.height)), Rect(self.position, (self.width, self.height))]
+        if drag_rect != state[2]:
+            rects += [rect for rect in (drag_rect, state[2]) if rect]
+        if thinking != state[3]:
+            rects.append(Rect(self.thinking_label.get_pos(), self.thinking_label.get_dimensions()))
+        return rects
 
     def draw(self, screen: Surface) -> None:
         """Draws the Checkers background and the still pawns on the background, not including the pawn being jumped."""
-        # Draw the background.
-        screen.blit(self.background, self.position)
-        for row in range(self.dimensions):
-            for col in range(self.dimensions):
-                color = LIGHTBROWN if (col + row) % 2 else DARKBROWN
-                position = self.square_anchor + Vector2(col * self.square_size, row * self.square_size)
-                square = Rect(position, (self.square_size, self.square_size))
-                draw.rect(screen, color, square)
-                icon = self.icons[self.pawns[row][col]]
-                # Position the icon in the center of the checker square
-                position += Vector2(self.square_size - icon.get_width(), self.square_size - icon.get_height()) / 2
-                if (row, col) != self.selected_pawn:  # Draw the selected pawn at the mouse cursor.
-                    screen.blit(icon, position)
-
-                if self.selected_pawn and self.moves and Vector2(row, col) in self.moves:
-                    draw.circle(screen, LIGHT_BLUE, position, 15)
+        self.drawn = self.frame or self.frame_state()
+
+        # Draw the squares and the still pawns, redrawn into their layer only when they change.
+        screen.blit(self.board_layer(), self.position)
+
+        # Highlight the squares the selected pawn can hop to.
+        if self.selected_pawn:
+            for position in self.highlights:
+                draw.circle(screen, LIGHT_BLUE, position, 15)
 
         # Draw the pawn at the mouse cursor if one is selected.
         if self.selected_pawn:
-            mouse_pos = Vector2(mouse.get_pos())
-            icon = self.icons[self.get_sel_pawn_id()]
-            screen.blit(icon, mouse_pos - Vector2(self.square_size, self.square_size) / 2)
+            screen.blit(self.icons[self.get_sel_pawn_id()], self.drawn[2])
+
+        # Show that the CPU is searching for its move.
+        if self.drawn[3]:
+            self.thinking_label.draw(screen)
 
 
 
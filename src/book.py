@@ -0,0 +1,211 @@
+"""Opening book of searched moves for the starting layouts, stored sorted by position hash and probed from a
+memory-mapped file, without depending on pygame.
+
+File layout (little endian):
+    header: magic b'CKOB', version (H), dimensions (H), entry count (Q)
+    entries: position hash with the side to move (Q), move origin (H), move destination (H), CRC-32 of the move's
+             whole path (I), weight (H), sorted by hash so the moves of a position are found with a binary search
+"""
+import mmap
+import os
+import zlib
+from argparse import ArgumentParser
+from random import choices
+from struct import Struct
+from time import perf_counter
+
+from bitboard import Bitboard, BLACK
+from movegen import Move, generate_moves
+from search import Engine, WIN_SCORE
+
+MAGIC = b'CKOB'
+VERSION = 2
+HEADER = Struct('<4sHHQ')
+ENTRY = Struct('<QHHIH')
+
+# Defaults of the book builder.
+PLIES = 8  # Number of plies from the starting layout covered by the book.
+DEPTH = 6  # Depth every book position is searched to.
+MARGIN = 10  # Moves scoring within this much of the best move are kept as alternatives.
+WIDTH = 2  # Most moves kept for each book position.
+
+
+def path_hash(move: Move) -> int:
+    """Returns the CRC-32 of the squares of the move's path, which tells apart capture chains with the same start and
+    end squares."""
+    return zlib.crc32(b''.join(square.to_bytes(2, 'little') for square in move.path))
+
+
+class OpeningBook:
+    """
+    Read-only opening book opened with mmap, so nothing is loaded up front and a probe only touches the pages its
+    binary search reads.
+
+    Parameters:
+        path: Path of a book file written by write().
+
+    Attributes:
+        dimensions: Board size the book covers.
+        count: Number of entries in the book.
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, 'rb')
+        if os.fstat(self.file.fileno()).st_size < HEADER.size:  # Too short to map or to hold a header.
+            self.file.close()
+            raise ValueError(f"{path} is not a version {VERSION} opening book file.")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.dimensions, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} opening book file.")
+
+    def entry(self, index: int) -> tuple[int, int, int, int, int]:
+        """Returns the (key, start, end, path hash, weight) of the entry at index."""
+        return ENTRY.unpack_from(self.data, HEADER.size + index * ENTRY.size)
+
+    def probe(self, board: Bitboard, color: int) -> list[tuple[Move, int]]:
+        """Returns every book move of color on board along with its weight, or an empty list if the position is not
+        in the book."""
+        if board.dimensions != self.dimensions:
+            return []
+        key = board.key(color)
+
+        # Find the first entry of the position.
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.entry(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        book_moves = []
+        moves = None
+        while low < self.count:
+            entry_key, start, end, move_hash, weight = self.entry(low)
+            if entry_key != key:
+                break
+            moves = moves or generate_moves(board, color)
+            # Match the entry against the legal moves in case of a hash collision, by the whole path, since capture
+            # chains with the same start and end squares can take different pawns.
+            for move in moves:
+                if move.start() == start and move.end() == end and path_hash(move) == move_hash:
+                    book_moves.append((move, weight))
+                    break
+            low += 1
+        return book_moves
+
+    def choose(self, board: Bitboard, color: int) -> Move:
+        """Returns a book move of color on board picked at random by weight, or None if the position is not in the
+        book."""
+        book_moves = self.probe(board, color)
+        if not book_moves:
+            return None
+        return choices([move for move, weight in book_moves], [weight for move, weight in book_moves])[0]
+
+    def close(self) -> None:
+        """Unmaps and closes the file."""
+        self.data.close()
+        self.file.close()
+
+
+def open_book(path: str) -> OpeningBook:
+    """Returns the opening book at path, or None if the file does not exist or is not a book of the current version,
+    so the CPU plays without a book until it is rebuilt."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return OpeningBook(path)
+    except ValueError as error:
+        print(f'[BOOK IGNORED]: {error} Rebuild it by running book.py.')
+        return None
+
+
+def score_moves(engine: Engine, board: Bitboard, color: int, moves: list[Move], depth: int) -> list[int]:
+    """Returns the exact score of every move of color on board, each searched depth plies deep."""
+    engine.begin()
+    scores = []
+    for move in moves:
+        captured = board.make(move)
+        scores.append(-engine.negamax(board, 1 - color, depth - 1, -WIN_SCORE - 1, WIN_SCORE + 1, 1))
+        board.unmake(move, captured)
+    return scores
+
+
+def build(dimensions: int, rows: list[int], plies: int = PLIES, depth: int = DEPTH, margin: int = MARGIN,
+          width: int = WIDTH, verbose: bool = True) -> list[tuple[int, int, int, int, int]]:
+    """Returns the (key, start, end, path hash, weight) entries of a book for the starting layouts with each number
+    of rows.
+
+    Every position is searched and its best moves, up to width of them within margin of the best score, are entered
+    with weights favoring the better moves. The positions they lead to are searched in turn until plies moves deep.
+    """
+    engine = Engine(time_limit=0, max_depth=depth)
+    entries = []
+    for row_count in rows:
+        start_time = perf_counter()
+        seen = set()
+        frontier = [(Bitboard.starting(dimensions, row_count), BLACK)]
+        for ply in range(plies):
+            next_frontier = []
+            for board, color in frontier:
+                key = board.key(color)
+                if key in seen:
+                    continue
+                seen.add(key)
+                moves = generate_moves(board, color)
+                if not moves:
+                    continue
+
+                scored = sorted(zip(score_moves(engine, board, color, moves, depth), range(len(moves))), reverse=True)
+                best = scored[0][0]
+                for score, index in scored[:width]:
+                    if best - score > margin:
+                        break
+                    move = moves[index]
+                    entries.append((key, move.start(), move.end(), path_hash(move), margin + 1 - (best - score)))
+                    child = board.copy()
+                    child.apply(move)
+                    next_frontier.append((child, 1 - color))
+            frontier = next_frontier
+
+        if verbose:
+            print(f'[BOOK] {dimensions} x {dimensions}, {row_count} rows: {len(seen)} positions searched in '
+                  f'{perf_counter() - start_time:.1f}s')
+    return entries
+
+
+def write(path: str, dimensions: int, entries: list[tuple[int, int, int, int, int]]) -> None:
+    """Writes the header and the entries sorted by key to path."""
+    entries = sorted(set(entries))
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, dimensions, len(entries)))
+        for entry in entries:
+            file.write(ENTRY.pack(*entry))
+
+
+def main():
+    """Builds opening book files from the command line, one for each board size."""
+    parser = ArgumentParser(description="Build checkers opening books by searching the starting layouts.")
+    parser.add_argument('--dimensions', type=int, nargs='+', default=list(range(8, 21, 2)),
+                        help="Board sizes to build a book for, every size offered in the menus by default.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1, 2, 3], help="Numbers of rows of pawns to cover.")
+    parser.add_argument('--plies', type=int, default=PLIES, help="Number of plies covered by the book.")
+    parser.add_argument('--depth', type=int, default=DEPTH, help="Depth every book position is searched to.")
+    parser.add_argument('--margin', type=int, default=MARGIN, help="Score margin of alternative moves.")
+    parser.add_argument('--width', type=int, default=WIDTH, help="Most moves kept for each position.")
+    parser.add_argument('--output', default='../assets/data', help="Directory to write the book files to.")
+    arguments = parser.parse_args()
+
+    os.makedirs(arguments.output, exist_ok=True)
+    for dimensions in arguments.dimensions:
+        entries = build(dimensions, arguments.rows, arguments.plies, arguments.depth, arguments.margin,
+                        arguments.width)
+        path = os.path.join(arguments.output, f'opening_{dimensions}.book')
+        write(path, dimensions, entries)
+        print(f'[BOOK WRITTEN]: {path} ({os.path.getsize(path)} bytes)')
+
+
+if __name__ == '__main__':
+    main()
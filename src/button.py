@@ -53,14 +53,20 @@ class Button(Label):
 
     def disable(self):
         self.enabled = False
-        self.icon = self.normal_surface
+        self.set_icon(self.normal_surface)
+
+    def set_icon(self, icon: Surface) -> None:
+        """Sets the surface drawn for the button, marking the button dirty when it changes."""
+        if icon is not self.icon:
+            self.icon = icon
+            self.mark_dirty(self.hitbox)
 
     def process(self, events: list[Event]) -> None:
         """Updates the button's state depending on the mouse position and checks for clicks."""
         if self.hitbox.collidepoint(Vector2(mouse.get_pos())):
-            self.icon = self.highlight_surface
+            self.set_icon(self.highlight_surface)
             for e in events:  # Check if user left-clicked while hovering over the button.
                 if e.type == MOUSEBUTTONDOWN and mouse.get_pressed(3)[0]:
                     post(self.event_on_press)
         else:  # Otherwise, the normal button surface is displayed.
-            self.icon = self.normal_surface
+            self.set_icon(self.normal_surface)
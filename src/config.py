@@ -6,6 +6,8 @@ SCREEN_WIDTH = 1920
 SCREEN_HEIGHT = 1080
 SCREEN_CENTER = Vector2(SCREEN_WIDTH, SCREEN_HEIGHT) / 2
 DISPLAY_FLAGS = pygame.FULLSCREEN | pygame.SCALED
+DIRTY_RECTS = False  # Whether each frame redraws only the areas the assets changed, for low-power displays.
+CACHE_DEBUG = False  # Whether the image and text caches' statistics are printed when the application exits.
 
 # Both COLUMNS and ROWS should always be odd so that CENTER_COLUMN and CENTER_ROW will be correct.
 COLUMNS = 21  # Should always be odd.
@@ -33,6 +35,7 @@ TURN_STARTED = event.custom_type()
 TURN_CANCELED = event.custom_type()
 TURN_ENDED = event.custom_type()
 CPU_TURN = event.custom_type()
+CPU_MOVE_READY = event.custom_type()
 FRAME_TIMER = event.custom_type()
 
 BLACK_WINS = event.custom_type()
@@ -47,8 +50,23 @@ LOCAL_CPU = 1
 LAN_HOST = 2
 LAN_JOIN = 3
 
+# Constants for the CPU difficulty levels and the search budget used at each level.
+CPU_EASY = 0
+CPU_NORMAL = 1
+CPU_HARD = 2
+CPU_SEARCH_LIMITS = {
+    CPU_EASY: {'time_limit': 0.05, 'max_depth': 2},
+    CPU_NORMAL: {'time_limit': 0.5, 'max_depth': 8},
+    CPU_HARD: {'time_limit': 2.0, 'max_depth': 64},
+}
+CPU_WORKERS = 1  # Number of processes the CPU's search is split across, 1 searches on a thread of this process.
+CPU_PONDER = True  # Whether the CPU searches during the user's turn, only when it searches on a thread of this process.
+CPU_ENGINE_PROCESS = False  # Whether the CPU's engine runs as a subprocess speaking protocol.py's text protocol.
+CPU_ENGINE_COMMAND = None  # Command launching an external engine subprocess, the built-in engine if None.
+CPU_DEBUG = False  # Whether the CPU's book moves and search statistics are printed after each of its moves.
+
 # Network constants.
 START_MESSAGE = "START"
-BOARD_STATE_MESSAGE = "BOARD"
+MOVE_MESSAGE = "MOVE"  # Followed by the squares of the move's path, e.g. "MOVE,40,33".
 BOARD_SPECIFICATION_MESSAGE = "SPECS"
 CLIENT_LEFT_MESSAGE = "CLIENT LEFT"
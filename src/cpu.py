@@ -0,0 +1,146 @@
+"""Runs the CPU player's search off the render thread and delivers its move through pygame's event queue."""
+from threading import Lock, Thread
+from time import perf_counter
+
+from pygame.event import Event, post
+
+from bitboard import Bitboard
+from book import OpeningBook
+from config import CPU_MOVE_READY
+from parallel import ParallelEngine
+from protocol import EngineProcess
+from search import Engine, SearchResult
+
+
+class CPUPlayer:
+    """
+    Searches for the CPU's moves on a worker thread so the main loop keeps rendering and handling input. When the
+    search finishes, a CPU_MOVE_READY event is posted with the move, the search result and the search's id. Positions
+    in the opening book are answered right away without searching.
+
+    While the opponent is deciding, the CPU can ponder: it guesses the opponent's reply from the principal variation
+    of its last search and searches its answer to that reply without a time limit. If the guess is right, the ponder
+    search becomes the real search and only runs for what is left of the time budget, so the CPU answers almost
+    immediately. Otherwise it is stopped, and its transposition table entries still speed up the real search.
+
+    Parameters:
+        engine: The search engine used to choose moves, searching on this process, split across several or in an
+            engine subprocess.
+
+    Keyword Arguments:
+        book: Opening book consulted before searching, if any.
+
+    Attributes:
+        search_id: Id of the latest search, events carrying an older id are stale and should be ignored.
+        pondering: Whether the running search is a ponder search whose move must not be posted yet.
+        ponder_hits: Number of turns answered by a ponder search.
+    """
+
+    CANCEL_POLL = 0.01  # Seconds between stop requests while waiting for a canceled search to end.
+
+    def __init__(self, engine: Engine | ParallelEngine | EngineProcess, book: OpeningBook = None):
+        self.engine = engine
+        self.book = book
+        self.thread: Thread = None
+        self.search_id = 0
+        self.lock = Lock()  # Guards the ponder state shared with the worker thread.
+        self.pondering = False
+        self.ponder_key: int = None  # Hash of the position the ponder search is searching, with the CPU to move.
+        self.ponder_start = 0
+        self.ponder_result: SearchResult = None  # Result of a ponder search that finished before its hit.
+        self.ponder_hits = 0
+
+    def start(self, board: Bitboard, color: int) -> None:
+        """Starts searching a copy of board for color's best move, canceling any search still running. A book move
+        is posted immediately instead, and a ponder search on the same position is kept and finishes the turn."""
+        if self.pondering and board.key(color) == self.ponder_key:
+            self.ponder_hit()
+            return
+
+        self.cancel()
+        self.search_id += 1
+        move = self.book.choose(board, color) if self.book else None
+        if move:
+            post(Event(CPU_MOVE_READY, move=move, result=SearchResult(move, 0, 0, 0, 0), search_id=self.search_id,
+                       book=True))
+            return
+        self.thread = Thread(target=self.run, args=(board.copy(), color, self.search_id), daemon=True)
+        self.thread.start()
+
+    def ponder(self, board: Bitboard, color: int) -> None:
+        """Starts pondering while color, the opponent, decides on board. Only a single process engine ponders, and
+        only once a search has left a principal variation to guess the opponent's reply from."""
+        self.cancel()
+        if not isinstance(self.engine, Engine):
+            return
+        line = self.engine.principal_variation(board, color, 1)
+        if not line:
+            return
+
+        child = board.copy()
+        child.apply(line[0])
+        self.search_id += 1
+        with self.lock:
+            self.pondering = True
+            self.ponder_key = child.key(1 - color)
+            self.ponder_start = perf_counter()
+            self.ponder_result = None
+        self.thread = Thread(target=self.run, args=(child, 1 - color, self.search_id, 0), daemon=True)
+        self.thread.start()
+
+    def ponder_hit(self) -> None:
+        """Turns the ponder search into the real search, giving it what is left of the time budget."""
+        with self.lock:
+            self.pondering = False
+            self.ponder_hits += 1
+            if self.ponder_result:  # The ponder search already finished, answer with its move.
+                result = self.ponder_result
+                post(Event(CPU_MOVE_READY, move=result.move, result=result, search_id=self.search_id, book=False))
+                return
+            if self.engine.time_limit:  # Taken over by the search even if it has not begun yet.
+                self.engine.set_deadline(self.ponder_start + self.engine.time_limit)
+
+    def run(self, board: Bitboard, color: int, search_id: int, time_limit: float = None) -> None:
+        """Worker thread body that searches the board and posts the result unless the search was canceled or is a
+        ponder search still waiting for its hit."""
+        if time_limit is None:
+            result: SearchResult = self.engine.search(board, color)
+        else:
+            result = self.engine.search(board, color, time_limit)
+        with self.lock:
+            if search_id != self.search_id:
+                return
+            if self.pondering:
+                self.ponder_result = result
+            else:
+                post(Event(CPU_MOVE_READY, move=result.move, result=result, search_id=search_id, book=False))
+
+    def cancel(self) -> None:
+        """Stops the running search or ponder search, if any, and waits for the worker thread to end without posting
+        its move."""
+        with self.lock:
+            self.search_id += 1  # Invalidate the running search's result before it can be posted.
+            self.pondering = False
+            self.ponder_result = None
+        while self.thread and self.thread.is_alive():
+            # Stop repeatedly in case the search had not started yet when the first request was made.
+            self.engine.stop()
+            self.thread.join(CPUPlayer.CANCEL_POLL)
+        self.thread = None
+        if isinstance(self.engine, Engine):  # Withdraw a ponder hit's deadline that came after its search ended.
+            self.engine.set_deadline(None)
+
+    def close(self) -> None:
+        """Cancels any running search, stops the engine's worker or engine processes if it has any and closes the
+        book."""
+        self.cancel()
+        if isinstance(self.engine, (ParallelEngine, EngineProcess)):
+            self.engine.shutdown()
+        if self.book:
+            self.book.close()
+            self.book = None
+
+    def is_thinking(self) -> bool:
+        """Returns whether a search for the CPU's turn is running, pondering during the opponent's turn does not
+        count."""
+        return bool(self.thread and self.thread.is_alive() and not self.pondering)
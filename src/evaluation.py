@@ -0,0 +1,142 @@
+"""Static evaluation built from named features with weights loaded from a file, without depending on pygame."""
+import json
+import os
+
+from bitboard import Bitboard, BLACK_PAWN, RED_PAWN, BLACK_KING, RED_KING, BLACK, RED, squares
+
+# Every feature is counted for black minus red, so a position's features flip sign when the colors are swapped.
+FEATURES = (
+    'material',  # Pawns that have not been promoted.
+    'kings',
+    'advancement',  # Rows pawns have advanced towards promotion.
+    'back_rank',  # Pawns still guarding their own back row, keeping the opponent from promoting.
+    'mobility',  # Single steps and jumps available, whoever is to move.
+    'center',  # Pawns and kings on the middle half of the board.
+)
+
+# Scores are in hundredths of a pawn. The default weights give the material and advancement evaluation the engine
+# has always used, tuned weights are loaded from a file written by tuning.py.
+DEFAULT_WEIGHTS = {
+    'material': 100,
+    'kings': 160,
+    'advancement': 2,
+    'back_rank': 0,
+    'mobility': 0,
+    'center': 0,
+}
+
+MASK_CACHE = {}
+
+
+def masks(dimensions: int) -> dict:
+    """Returns the back row masks of each color and the center mask for a board size, computed once per size."""
+    if dimensions not in MASK_CACHE:
+        row = sum(1 << col for col in range(dimensions))
+        quarter = dimensions // 4
+        center = 0
+        for center_row in range(quarter, dimensions - quarter):
+            for col in range(quarter, dimensions - quarter):
+                center |= 1 << (center_row * dimensions + col)
+        MASK_CACHE[dimensions] = {
+            'back_rank': {BLACK: row << ((dimensions - 1) * dimensions), RED: row},
+            'center': center,
+        }
+    return MASK_CACHE[dimensions]
+
+
+def material(board: Bitboard) -> int:
+    """Returns black's pawns minus red's."""
+    return board.counts[BLACK_PAWN] - board.counts[RED_PAWN]
+
+
+def kings(board: Bitboard) -> int:
+    """Returns black's kings minus red's."""
+    return board.counts[BLACK_KING] - board.counts[RED_KING]
+
+
+def advancement(board: Bitboard) -> int:
+    """Returns the rows black's pawns have advanced minus red's."""
+    dimensions = board.dimensions
+    return sum(dimensions - 1 - square // dimensions for square in squares(board.masks[BLACK_PAWN])) - \
+        sum(square // dimensions for square in squares(board.masks[RED_PAWN]))
+
+
+def back_rank(board: Bitboard) -> int:
+    """Returns black's pawns on its back row minus red's."""
+    rows = masks(board.dimensions)['back_rank']
+    return (board.masks[BLACK_PAWN] & rows[BLACK]).bit_count() - (board.masks[RED_PAWN] & rows[RED]).bit_count()
+
+
+def mobility(board: Bitboard) -> int:
+    """Returns black's single steps and jumps minus red's."""
+    return sum(board.mobility(BLACK)) - sum(board.mobility(RED))
+
+
+def center(board: Bitboard) -> int:
+    """Returns black's pawns and kings on the middle half of the board minus red's."""
+    middle = masks(board.dimensions)['center']
+    return (board.pieces(BLACK) & middle).bit_count() - (board.pieces(RED) & middle).bit_count()
+
+
+FEATURE_FUNCTIONS = {
+    'material': material,
+    'kings': kings,
+    'advancement': advancement,
+    'back_rank': back_rank,
+    'mobility': mobility,
+    'center': center,
+}
+
+
+def features(board: Bitboard) -> list[int]:
+    """Returns the value of every feature of board in FEATURES order."""
+    return [FEATURE_FUNCTIONS[name](board) for name in FEATURES]
+
+
+class Evaluation:
+    """
+    Weighted sum of named features. Features with a zero weight are skipped, so unused features cost nothing per
+    node.
+
+    Keyword Arguments:
+        weights: Weight of each feature by name, missing features use DEFAULT_WEIGHTS.
+
+    Attributes:
+        weights: Weight of every feature by name.
+    """
+
+    def __init__(self, weights: dict = None):
+        unknown = set(weights or {}) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown evaluation features: {', '.join(sorted(unknown))}.")
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.material_weights = (self.weights['material'], self.weights['kings'])
+        self.extra = [(FEATURE_FUNCTIONS[name], weight) for name, weight in self.weights.items()
+                      if weight and name not in ('material', 'kings')]
+
+    @classmethod
+    def load(cls, path: str) -> 'Evaluation':
+        """Returns the evaluation with the weights in the JSON file at path."""
+        with open(path) as file:
+            return cls(json.load(file))
+
+    def save(self, path: str) -> None:
+        """Writes the weights to a JSON file at path."""
+        with open(path, 'w') as file:
+            json.dump(self.weights, file, indent=4)
+
+    def evaluate(self, board: Bitboard, color: int) -> int:
+        """Returns the score of board from the perspective of color."""
+        counts = board.counts
+        pawn_weight, king_weight = self.material_weights
+        score = (counts[BLACK_PAWN] - counts[RED_PAWN]) * pawn_weight + \
+                (counts[BLACK_KING] - counts[RED_KING]) * king_weight
+        for feature, weight in self.extra:
+            score += feature(board) * weight
+        score = round(score)
+        return score if color == BLACK else -score
+
+
+def load_evaluation(path: str) -> Evaluation:
+    """Returns the evaluation with the weights in the file at path, or the default one if the file does not exist."""
+    return Evaluation.load(path) if path and os.path.exists(path) else Evaluation()
@@ -1,17 +1,23 @@
-"""Preloads all the sounds and images used in the checkers game."""
-from pygame import image, mixer
+"""Preloads all the sounds used in the checkers game and locates its images, which are loaded by images.py."""
+from pygame import mixer
 import os
 
 mixer.init()  # The pygame mixer needs to be initialized before loading sounds.
 
-# Image objects:
-RED_PAWN_ICON = image.load(os.path.join('../assets/images', 'red_pawn.png'))
-BLACK_PAWN_ICON = image.load(os.path.join('../assets/images', 'grey_pawn.png'))
-RED_KING_ICON = image.load(os.path.join('../assets/images', 'red_king.png'))
-BLACK_KING_ICON = image.load(os.path.join('../assets/images', 'grey_king.png'))
-ARROW_ICON = image.load(os.path.join('../assets/images', 'arrow.png'))
+# Image files, loaded and converted once the display exists by images.IMAGES:
+RED_PAWN_ICON = os.path.join('../assets/images', 'red_pawn.png')
+BLACK_PAWN_ICON = os.path.join('../assets/images', 'grey_pawn.png')
+RED_KING_ICON = os.path.join('../assets/images', 'red_king.png')
+BLACK_KING_ICON = os.path.join('../assets/images', 'grey_king.png')
+ARROW_ICON = os.path.join('../assets/images', 'arrow.png')
+BACKGROUND_IMAGE = os.path.join('../assets/images', 'background.png')
 
 # Sound objects:
 SOUND_BUTTON_FOCUS = mixer.Sound(os.path.join('../assets/sounds', 'button_focus.wav'))
 SOUND_BUTTON_SELECT = mixer.Sound(os.path.join('../assets/sounds', 'button_select.wav'))
 MAIN_THEME = os.path.join('../assets/sounds', 'test.mp3')
+
+# Data files generated by the engine tools, formatted with the board dimensions:
+TABLEBASE_FILE = os.path.join('../assets/data', 'endgame_{dimensions}.tb')
+OPENING_BOOK_FILE = os.path.join('../assets/data', 'opening_{dimensions}.book')
+EVALUATION_FILE = os.path.join('../assets/data', 'evaluation_{dimensions}.json')
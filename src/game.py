@@ -0,0 +1,117 @@
+"""Headless checkers game holding the position, the rules and the result, without depending on pygame."""
+from bitboard import Bitboard, BLACK, RED
+from journal import MoveJournal
+from movegen import Move, generate_moves, hop
+
+# Constants for tracking who wins the game.
+NO_WIN = 0
+BLACK_WIN = 1
+RED_WIN = 2
+
+
+class Game:
+    """
+    A game of checkers that moves pawns by the rules and decides the winner. Black moves first. A turn is played
+    either one hop at a time, as a user clicks through a capture chain, or as a whole move.
+
+    Parameters:
+        dimensions: Length and width of the board in spaces.
+        rows: Number of rows of pawns.
+
+    Attributes:
+        bitboard: The current position.
+        turn: Color of the side to move.
+        path: Squares visited by the pawn being moved this turn.
+        legal_moves: Every legal move of the side to move, generated once per turn.
+        hops: Squares that can be hopped to next after each path a legal move starts with, indexed once per turn.
+        move_paths: Legal moves by their path, the paths after which the turn may end.
+        journal: Moves played so far, used to cancel a turn and take turns back.
+        result: NO_WIN while the game goes on, otherwise BLACK_WIN or RED_WIN.
+    """
+
+    def __init__(self, dimensions: int, rows: int):
+        self.dimensions = dimensions
+        self.bitboard = Bitboard.starting(dimensions, rows)
+        self.turn = BLACK
+        self.path: list[int] = []
+        self.legal_moves: list[Move] = []
+        self.hops: dict[tuple[int, ...], set[int]] = {}
+        self.move_paths: dict[tuple[int, ...], Move] = {}
+        self.journal = MoveJournal()
+        self.result = NO_WIN
+        self.update()
+
+    def next_hops(self, start: int) -> set[int]:
+        """Returns the squares the pawn on start can hop to next, looked up from the legal moves that continue the
+        path moved so far."""
+        return self.hops.get(tuple(self.path) if self.path else (start,), set())
+
+    def play_hop(self, start: int, end: int) -> bool:
+        """Moves the pawn on start to end as part of the turn's move, removing any jumped pawn and promoting it at
+        the end of the board. Returns whether the path is now a whole legal move, i.e. the turn may end."""
+        if end not in self.next_hops(start):
+            raise ValueError(f"Hop from {start} to {end} is not legal.")
+        self.journal.play(self.bitboard, hop(self.bitboard, start, end))
+        if not self.path:
+            self.path.append(start)
+        self.path.append(end)
+        return tuple(self.path) in self.move_paths
+
+    def play_move(self, move: Move) -> None:
+        """Plays a whole move as the turn's move."""
+        self.journal.play(self.bitboard, move)
+        self.path = list(move.path)
+
+    def cancel_turn(self) -> None:
+        """Takes back the hops played this turn."""
+        self.journal.cancel_turn(self.bitboard)
+        self.path = []
+
+    def end_turn(self) -> None:
+        """Passes the turn to the other side and decides whether it has lost."""
+        self.journal.end_turn()
+        self.turn = 1 - self.turn
+        self.path = []
+        self.update()
+
+    def set_position(self, bitboard: Bitboard) -> None:
+        """Replaces the position, for when it is received rather than played. Earlier turns cannot be taken back."""
+        self.bitboard = bitboard
+        self.journal.clear()
+        self.path = []
+        self.update()
+
+    def take_back(self, turns: int = 1) -> int:
+        """Takes back up to turns finished turns along with the turn in progress and returns how many were taken
+        back."""
+        taken = self.journal.take_back(self.bitboard, turns)
+        self.turn = (self.turn + taken) % 2
+        self.path = []
+        self.update()
+        return taken
+
+    def redo(self) -> bool:
+        """Replays the last turn taken back. Returns whether there was one."""
+        if not self.journal.redo(self.bitboard):
+            return False
+        self.turn = 1 - self.turn
+        self.update()
+        return True
+
+    def update(self) -> None:
+        """Generates the legal moves of the side to move and decides the result. The side to move loses when it has
+        no pawns or no legal moves left, read from the bitboard's running counts and mobility."""
+        self.legal_moves = generate_moves(self.bitboard, self.turn)
+        self.move_paths = {move.path: move for move in self.legal_moves}
+        self.hops = {}
+        for path in self.move_paths:
+            for length in range(1, len(path)):
+                self.hops.setdefault(path[:length], set()).add(path[length])
+        if not self.bitboard.count(self.turn) or self.bitboard.mobility(self.turn) == (0, 0):
+            self.result = RED_WIN if self.turn == BLACK else BLACK_WIN
+        else:
+            self.result = NO_WIN
+
+    def winner(self) -> int:
+        """Returns the color of the winner, or None while the game goes on."""
+        return {NO_WIN: None, BLACK_WIN: BLACK, RED_WIN: RED}[self.result]
@@ -0,0 +1,72 @@
+"""Shared cache of the images drawn in the game, converted to the display's pixel format and pre-scaled once."""
+from pygame import Surface, SRCALPHA, display, image, transform
+
+
+class ImageCache:
+    """
+    Loads every image once and hands out copies scaled to the sizes asked for, cached by (path, size) so boards of the
+    same size, rematches and repeated games reuse them. Once the display exists, the images are converted to its
+    pixel format, with convert_alpha for images with transparency, otherwise every blit would convert each pixel
+    again. Images asked for before the display exists are handed out as loaded and converted on the next request
+    after it is created.
+
+    Attributes:
+        originals: The images as loaded by their path.
+        scaled: The scaled images by their path and size.
+        converted: Whether the cached images are in the display's pixel format.
+        hits: Number of requests answered from the cache.
+        misses: Number of requests that loaded or scaled an image.
+    """
+
+    def __init__(self):
+        self.originals: dict[str, Surface] = {}
+        self.scaled: dict[tuple[str, tuple[int, int]], Surface] = {}
+        self.converted = False
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def convert(surface: Surface) -> Surface:
+        """Returns the surface in the display's pixel format, keeping its transparency if it has any."""
+        return surface.convert_alpha() if surface.get_flags() & SRCALPHA else surface.convert()
+
+    def get(self, path: str, size: tuple[int, int] = None) -> Surface:
+        """Returns the image at path, scaled to size if given. The surface is shared, it must not be drawn on."""
+        if not self.converted and display.get_surface():  # The display was created since the last request.
+            self.originals = {key: ImageCache.convert(surface) for key, surface in self.originals.items()}
+            self.scaled.clear()  # Scaled again from the converted originals, in the same format.
+            self.converted = True
+
+        key = (path, tuple(map(int, size)) if size else None)
+        surface = self.scaled.get(key) if size else self.originals.get(path)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+
+        if path not in self.originals:
+            original = image.load(path)
+            self.originals[path] = ImageCache.convert(original) if self.converted else original
+        surface = self.originals[path]
+        if size:  # An image asked for at its own size is shared rather than copied.
+            surface = self.scaled[key] = surface if surface.get_size() == key[1] else transform.scale(surface, key[1])
+        return surface
+
+    def memory(self) -> int:
+        """Returns the number of bytes of pixels held by the cached surfaces."""
+        surfaces = {id(surface): surface for surface in [*self.originals.values(), *self.scaled.values()]}
+        return sum(surface.get_pitch() * surface.get_height() for surface in surfaces.values())
+
+    def statistics(self) -> dict:
+        """Returns the number of images held, the memory of their pixels and the cache's hit rate."""
+        return {
+            'images': len(self.originals),
+            'scaled': len(self.scaled),
+            'memory_mb': round(self.memory() / 2 ** 20, 2),
+            'hits': self.hits,
+            'misses': self.misses,
+            'converted': self.converted,
+        }
+
+
+IMAGES = ImageCache()  # The cache shared by every asset.
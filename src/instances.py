@@ -3,6 +3,7 @@ from background import CheckeredBackground
 from button import Button
 from colors import *
 from config import *
+from filepaths import BACKGROUND_IMAGE
 from label import Label
 from notification import Notification
 from radio import RadioButtonGroup
@@ -23,7 +24,7 @@ vertical_separation = 20
 min_width = 300
 RETURN_BUTTONS_LOCATION = POINTS[ROWS - 4][1]
 
-background = CheckeredBackground("/Users/gyldrwr/PycharmProjects/FinalProject/assets/images/background.png")
+background = CheckeredBackground(BACKGROUND_IMAGE)
 
 title = Label(text="Checkers",
               font_size=200,
@@ -95,17 +96,23 @@ board_dimensions_label = Label(text="Board Dimensions: ",
                                min_width=min_icon_width)
 board_dimensions_label.center(POINTS[label_row][board_dimensions_column])
 
-board_dimensions_button_group = RadioButtonGroup(vertical_separation=vertical_separation,
-                                                 font_size=font_size,
+# The board sizes use smaller buttons so all seven fit above the back button.
+board_dimensions_button_group = RadioButtonGroup(vertical_separation=vertical_separation / 2,
+                                                 font_size=int(font_size * 0.7),
                                                  min_width=min_icon_width,
-                                                 padding_y_up=y_padding / 2,
-                                                 padding_y_down=y_padding / 2,
+                                                 padding_y_up=y_padding / 4,
+                                                 padding_y_down=y_padding / 4,
+                                                 icon_scale=0.7,
                                                  buttons={
                                                      "8 x 8": 8,
                                                      "10 x 10": 10,
-                                                     "12 x 12": 12
+                                                     "12 x 12": 12,
+                                                     "14 x 14": 14,
+                                                     "16 x 16": 16,
+                                                     "18 x 18": 18,
+                                                     "20 x 20": 20
                                                  })
-board_dimensions_button_group.center(POINTS[button_group_row][board_dimensions_column])
+board_dimensions_button_group.center(POINTS[button_group_row + 2][board_dimensions_column])
 
 backdrop = Label(text="",
                  position=POINTS[1][1],
@@ -148,10 +155,13 @@ opponent_type_group = RadioButtonGroup(vertical_separation=vertical_separation,
                                        padding_y_up=y_padding / 2,
                                        padding_y_down=y_padding / 2,
                                        buttons={
-                                           "CPU": LOCAL_CPU,
-                                           "Human Player": LOCAL_HUMAN
+                                           "Easy CPU": (LOCAL_CPU, CPU_EASY),
+                                           "Normal CPU": (LOCAL_CPU, CPU_NORMAL),
+                                           "Hard CPU": (LOCAL_CPU, CPU_HARD),
+                                           "Human Player": (LOCAL_HUMAN, None)
                                        })
-opponent_type_group.center(POINTS[button_group_row][opponent_type_column])
+# The group has an extra button, so it is centered a row lower to keep it clear of its label.
+opponent_type_group.center(POINTS[button_group_row + 1][opponent_type_column])
 
 start_button = Button(text="Start",
                       font_size=100,
@@ -0,0 +1,74 @@
+"""Journal of the moves played in a game, used to cancel, undo and redo turns without copying the board."""
+from bitboard import Bitboard
+from movegen import Move
+
+
+class MoveJournal:
+    """
+    Records every move played on a board as (move, captured pawns) pairs, where the move holds its squares, captures
+    and promotion flag and the captured pawns are the identifiers make returned. Replaying a record backwards with
+    unmake takes the move back in time proportional to its length, so no board copies are needed.
+
+    A turn may be played as several single hops (the user clicking through a capture chain) or as one whole move
+    (the CPU), so the records of the turn in progress are kept apart until it ends.
+
+    Attributes:
+        turns: Records of each finished turn, oldest first.
+        current: Records of the turn in progress.
+        undone: Records of the turns taken back, most recently taken back last, until a new move is recorded.
+    """
+
+    def __init__(self):
+        self.turns: list[list[tuple[Move, tuple[int, ...]]]] = []
+        self.current: list[tuple[Move, tuple[int, ...]]] = []
+        self.undone: list[list[tuple[Move, tuple[int, ...]]]] = []
+
+    def play(self, board: Bitboard, move: Move) -> None:
+        """Plays move on board and records it as part of the turn in progress, which discards the redo history."""
+        self.current.append((move, board.make(move)))
+        self.undone.clear()
+
+    def end_turn(self) -> None:
+        """Closes the turn in progress, even if nothing was played so turns keep alternating between the colors."""
+        self.turns.append(self.current)
+        self.current = []
+
+    def cancel_turn(self, board: Bitboard) -> None:
+        """Takes back every move of the turn in progress."""
+        while self.current:
+            board.unmake(*self.current.pop())
+
+    def undo(self, board: Bitboard) -> bool:
+        """Cancels the turn in progress and takes back the last finished turn. Returns whether there was one."""
+        self.cancel_turn(board)
+        if not self.turns:
+            return False
+        turn = self.turns.pop()
+        for record in reversed(turn):
+            board.unmake(*record)
+        self.undone.append(turn)
+        return True
+
+    def redo(self, board: Bitboard) -> bool:
+        """Replays the last turn taken back. Returns whether there was one."""
+        if self.current or not self.undone:
+            return False
+        turn = [(move, board.make(move)) for move, captured in self.undone.pop()]
+        self.turns.append(turn)
+        return True
+
+    def take_back(self, board: Bitboard, count: int) -> int:
+        """Undoes up to count turns and returns how many were taken back."""
+        taken = 0
+        while taken < count and self.undo(board):
+            taken += 1
+        return taken
+
+    def clear(self) -> None:
+        """Forgets every recorded turn, for when the board is replaced rather than moved on."""
+        self.turns.clear()
+        self.current.clear()
+        self.undone.clear()
+
+    def __len__(self) -> int:
+        return len(self.turns)
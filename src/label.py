@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from os.path import join
 
 from pygame import Surface, Vector2, font
@@ -6,6 +7,61 @@ from asset import Asset
 from colors import *
 
 
+class TextCache:
+    """
+    Process-wide cache of the fonts and rendered label surfaces, so building the menus and re-rendering labels
+    neither reads and parses the font file nor rasterizes the same text over and over.
+
+    Keyword Arguments:
+        capacity: Number of rendered surfaces kept, the least recently used is dropped past it.
+
+    Attributes:
+        fonts: Font objects by their file and size, kept for the whole run.
+        surfaces: Rendered label surfaces by their text and style, from least to most recently used.
+        hits: Number of labels whose surface was found in the cache.
+        misses: Number of labels that had to be rendered.
+    """
+
+    CAPACITY = 256
+
+    def __init__(self, capacity: int = CAPACITY):
+        self.capacity = capacity
+        self.fonts: dict[tuple[str, int], font.Font] = {}
+        self.surfaces: OrderedDict[tuple, Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, font_file: str, font_size: int) -> font.Font:
+        """Returns the font object of the font file at the size, loading it on first use."""
+        key = (font_file, font_size)
+        if key not in self.fonts:
+            self.fonts[key] = font.Font(join('../assets/fonts', font_file), font_size)
+        return self.fonts[key]
+
+    def get(self, key: tuple) -> Surface:
+        """Returns the surface rendered for key and marks it as the most recently used, or None if it is not cached."""
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.surfaces.move_to_end(key)
+        return surface
+
+    def put(self, key: tuple, surface: Surface) -> None:
+        """Caches the surface rendered for key, dropping the least recently used surface past the capacity."""
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+
+    def statistics(self) -> dict:
+        """Returns the number of fonts and surfaces held and the cache's hits and misses."""
+        return {'fonts': len(self.fonts), 'surfaces': len(self.surfaces), 'hits': self.hits, 'misses': self.misses}
+
+
+TEXT_CACHE = TextCache()  # The cache shared by every label.
+
+
 class Label(Asset):
 
     """
@@ -62,7 +118,25 @@ class Label(Asset):
         super().__init__(position)
         self.text = text
 
-        font_object = font.Font(join('../assets/fonts', font_file), font_size)
+        # Labels of the same text and style share one rendered surface, which must not be drawn on.
+        key = (text, font_size, font_color, font_file, background_color, border_color, border_thickness,
+               padding_x_left, padding_x_right, padding_y_up, padding_y_down, alignment, min_width, min_height)
+        label_surface = TEXT_CACHE.get(key)
+        if label_surface is None:
+            label_surface = Label.render(*key)
+            TEXT_CACHE.put(key, label_surface)
+
+        self.icon = label_surface  # self.icon is the final surface that will be drawn on the screen each frame.
+        self.width = label_surface.get_width()
+        self.height = label_surface.get_height()
+        self.enabled = False  # Label object does not have a update method and therefore does not need to be updated.
+
+    @staticmethod
+    def render(text: str, font_size: int, font_color: tuple, font_file: str, background_color: tuple,
+               border_color: tuple, border_thickness: int, padding_x_left: int, padding_x_right: int,
+               padding_y_up: int, padding_y_down: int, alignment: str, min_width: int, min_height: int) -> Surface:
+        """Returns the surface of a label with the text and style given, as described by the class."""
+        font_object = TEXT_CACHE.get_font(font_file, font_size)
         font_surface = font_object.render(text, True, font_color)
         font_surface_width = font_surface.get_width()
         font_surface_height = font_surface.get_height()
@@ -107,10 +181,7 @@ class Label(Asset):
             border_surface.blit(label_surface, (border_thickness, border_thickness))
             label_surface = border_surface
 
-        self.icon = label_surface  # self.icon is the final surface that will be drawn on the screen each frame.
-        self.width = label_surface.get_width()
-        self.height = label_surface.get_height()
-        self.enabled = False  # Label object does not have a update method and therefore does not need to be updated.
+        return label_surface
 
     def center(self, position: Vector2) -> None:
         """Centers the label's position around the specified position."""
@@ -1,10 +1,12 @@
 import sys
 
-from pygame import key, K_F4, K_LALT
+from pygame import key, K_F4, K_LALT, Rect
 from pygame.event import post, Event
 
 from asset import Asset
 from board import CheckeredBoard
+from images import IMAGES
+from label import TEXT_CACHE
 from instances import *
 from network import Client, Server, pin
 from transition import Transition
@@ -25,6 +27,7 @@ def main():
     server = None  # Server object for hosting online games.
     running = True
     assets = main_menu_assets  # assets tracks the current assets in scope to draw on the screen.
+    drawn_assets = []  # The assets in scope when the whole screen was last drawn.
     while running:
         post(Event(FRAME_TIMER, {'dt': (clock.tick(MAX_FPS) / 1000)}))  # Update and record internal clock.
 
@@ -47,8 +50,9 @@ def main():
                 elif e.text == "Start":  # Local game of checkers is starting.
                     board_dimensions = int(board_dimensions_button_group.get_value())
                     rows = int(row_number_group.get_value())
-                    mode = int(opponent_type_group.get_value())
-                    board = CheckeredBoard(board_dimensions=board_dimensions, rows=rows, mode=mode)
+                    mode, difficulty = opponent_type_group.get_value()
+                    board = CheckeredBoard(board_dimensions=board_dimensions, rows=rows, mode=mode,
+                                           difficulty=difficulty)
                     board.center(SCREEN_CENTER)
                     post(Event(TRANSITION_START, assets=game_assets + [board]))
                 elif e.text == "Cancel":
@@ -152,15 +156,33 @@ def main():
             elif e.type == pygame.QUIT:
                 running = False
 
-        # Drawing the screen.
-        screen.fill(BLACK)
         for asset in assets:
             asset.update(events)
-            asset.draw(screen)
-
-        pygame.display.update()
+        dirty = [rect for asset in assets for rect in asset.dirty_rects()]
+
+        # Drawing the screen, in full unless only the changed areas are redrawn. The whole screen is redrawn when the
+        # assets in scope change, while a transition swaps them and when the window is resized or uncovered.
+        if not DIRTY_RECTS or assets != drawn_assets or any(isinstance(asset, Transition) for asset in assets) or \
+                any(e.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE) for e in events):
+            screen.fill(BLACK)
+            for asset in assets:
+                asset.draw(screen)
+            pygame.display.update()
+            drawn_assets = list(assets)
+        elif dirty:
+            dirty = merge_rects(dirty)
+            for rect in dirty:  # Redraw every asset clipped to the area, so the ones beneath it show through.
+                screen.set_clip(rect)
+                screen.fill(BLACK)
+                for asset in assets:
+                    asset.draw(screen)
+            screen.set_clip(None)
+            pygame.display.update(dirty)
 
     # Exiting the application.
+    if CACHE_DEBUG:
+        print(f'[IMAGE CACHE] {IMAGES.statistics()}')
+        print(f'[TEXT CACHE] {TEXT_CACHE.statistics()}')
     cleanup(client, server)
     sys.exit()
 
@@ -177,6 +199,18 @@ def toggle_assets(assets: list[Asset], enabled: bool, classes: list = None):
                 asset.disable()
 
 
+def merge_rects(rects: list[Rect]) -> list[Rect]:
+    """Returns the rects with every group of overlapping rects merged into their union, so no area is drawn twice."""
+    merged = []
+    for rect in rects:
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect = rect.union(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
 def cleanup(client: Client, server: Server) -> tuple[None, None]:
     """Deconstructs server and client and returns a tuple to reassign them to none (mainly to cleanup the ports)."""
     if client:
@@ -0,0 +1,127 @@
+"""Legal move generation for whole checkers moves, including capture chains, without depending on pygame."""
+from typing import NamedTuple
+
+from bitboard import Bitboard, BLACK_PAWN, RED_PAWN, BLACK_KING, RED_KING, BLACK, geometry
+
+# Directions as (row, col) offsets, black pawns may only use the first two and red pawns the last two.
+DIRECTIONS = ((-1, -1), (-1, 1), (1, 1), (1, -1))
+PAWN_DIRECTIONS = {
+    BLACK_PAWN: (0, 1),
+    RED_PAWN: (2, 3),
+    BLACK_KING: (0, 1, 2, 3),
+    RED_KING: (0, 1, 2, 3),
+}
+
+TABLE_CACHE = {}
+
+
+class Move(NamedTuple):
+    """
+    A complete move for one side.
+
+    Attributes:
+        path: Square indices visited by the moving pawn, starting with its origin.
+        captures: Square indices of the pawns jumped over, in order.
+        promotes: Whether the pawn becomes a king at the end of the move.
+    """
+    path: tuple
+    captures: tuple = ()
+    promotes: bool = False
+
+    def start(self) -> int:
+        """Returns the square the move starts on."""
+        return self.path[0]
+
+    def end(self) -> int:
+        """Returns the square the move ends on."""
+        return self.path[-1]
+
+
+def tables(dimensions: int) -> tuple[list, list]:
+    """Returns the neighbour and jump tables for a board size, computed once per size and kept between games.
+
+    neighbours[square][direction] is the adjacent square in that direction (or None if off the board) and
+    jumps[square][direction] is the (over, landing) square pair for a jump in that direction (or None)."""
+    if dimensions not in TABLE_CACHE:
+        neighbours = []
+        jumps = []
+        for square in range(dimensions * dimensions):
+            row, col = divmod(square, dimensions)
+            square_neighbours = []
+            square_jumps = []
+            for d_row, d_col in DIRECTIONS:
+                if 0 <= row + d_row < dimensions and 0 <= col + d_col < dimensions:
+                    square_neighbours.append((row + d_row) * dimensions + col + d_col)
+                else:
+                    square_neighbours.append(None)
+                if 0 <= row + d_row * 2 < dimensions and 0 <= col + d_col * 2 < dimensions:
+                    square_jumps.append(((row + d_row) * dimensions + col + d_col,
+                                         (row + d_row * 2) * dimensions + col + d_col * 2))
+                else:
+                    square_jumps.append(None)
+            neighbours.append(tuple(square_neighbours))
+            jumps.append(tuple(square_jumps))
+        TABLE_CACHE[dimensions] = (neighbours, jumps)
+    return TABLE_CACHE[dimensions]
+
+
+def hop(board: Bitboard, start: int, end: int) -> Move:
+    """Returns the single step or jump from start to end as a Move, capturing the pawn jumped over and promoting
+    a pawn that lands on the far row."""
+    pawn_id = board.get_square(start)
+    captures = ((start + end) // 2,) if abs(end // board.dimensions - start // board.dimensions) > 1 else ()
+    promotes = pawn_id < RED_KING and bool((1 << end) & geometry(board.dimensions)['promotion'][pawn_id % 2])
+    return Move((start, end), captures, promotes)
+
+
+def generate_moves(board: Bitboard, color: int, forced_captures: bool = True) -> list[Move]:
+    """Returns every complete legal move for color. Capture chains are followed to the end, and when
+    forced_captures is set only capturing moves are returned if any capture exists."""
+    own = board.pieces(color)
+    moves = []
+    if board.jumps(own):  # Cheap shift-based test before walking the jump table for whole chains.
+        jump_table = tables(board.dimensions)[1]
+        promotion = geometry(board.dimensions)['promotion'][color]
+        opponents = board.pieces(1 - color)
+        occupied = board.occupied()
+        for pawn_id in ((BLACK_PAWN, BLACK_KING) if color == BLACK else (RED_PAWN, RED_KING)):
+            mask = board.masks[pawn_id]
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                start = low.bit_length() - 1
+                # The moving pawn leaves its origin, so the origin counts as empty for the rest of the chain.
+                extend_chain(jump_table, PAWN_DIRECTIONS[pawn_id], pawn_id < RED_KING and promotion,
+                             opponents, occupied & ~low, [start], [], moves)
+
+    if not moves or not forced_captures:
+        promotion = geometry(board.dimensions)['promotion'][color]
+        pawns = board.masks[BLACK_PAWN if color == BLACK else RED_PAWN]
+        for start, end in board.steps(own):
+            moves.append(Move((start, end), (), bool(pawns & (1 << start) and promotion & (1 << end))))
+    return moves
+
+
+def extend_chain(jump_table: list, directions: tuple, promotion: int, opponents: int, occupied: int,
+                 path: list[int], captures: list[int], moves: list[Move]) -> None:
+    """Depth-first search of the jumps continuing from the end of path, appending each finished chain to moves.
+    Jumped pawns stay on the board until the move ends, so they block landings and cannot be jumped twice."""
+    square = path[-1]
+    extended = False
+    for direction in directions:
+        jump = jump_table[square][direction]
+        if jump:
+            over, land = jump
+            if opponents & (1 << over) and over not in captures and not occupied & (1 << land):
+                extended = True
+                path.append(land)
+                captures.append(over)
+                if promotion and promotion & (1 << land):  # Reaching the far row crowns the pawn and ends the move.
+                    moves.append(Move(tuple(path), tuple(captures), True))
+                else:
+                    extend_chain(jump_table, directions, promotion, opponents, occupied, path, captures, moves)
+                path.pop()
+                captures.pop()
+
+    if not extended and captures:
+        moves.append(Move(tuple(path), tuple(captures), False))
@@ -84,9 +84,6 @@ class Client:
                     print(f"[{self.address} CLIENT RECEIVED PIN]: {self.received_pin}")
                 else:
                     print(f'[{self.address} CLIENT RECEIVED MESSAGE]: {data}')
-                    post(Event(MESSAGE_RECEIVED, message=data))
-                    if data == CLIENT_LEFT_MESSAGE:
-                        data = ''
 
                 post(Event(MESSAGE_RECEIVED, message=data))
                 if data == CLIENT_LEFT_MESSAGE:
@@ -1,4 +1,4 @@
-from pygame import Vector2
+from pygame import Vector2, Rect
 from pygame.event import Event
 
 from asset import Asset
@@ -59,6 +59,13 @@ class Notification(Asset):
         for option in self.options:
             option.update(events)
 
+    def dirty_rects(self) -> list[Rect]:
+        """Returns the areas the options changed since the last call and forgets them."""
+        rects = super().dirty_rects()
+        for option in self.options:
+            rects += option.dirty_rects()
+        return rects
+
     def get_width(self) -> int:
         """Returns the width of the notification backdrop, including the border thickness."""
         return self.width
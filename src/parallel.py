@@ -0,0 +1,243 @@
+"""Parallel CPU search that splits the root moves across a process pool, without depending on pygame."""
+import os
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import Event as ProcessEvent
+from random import shuffle
+from time import perf_counter
+
+from bitboard import Bitboard, BLACK
+from evaluation import load_evaluation
+from movegen import Move, generate_moves
+from search import Engine, SearchResult, SearchTimeout, WIN_SCORE, MAX_PLY
+from tablebase import open_tablebase
+from transposition import TranspositionTable
+
+WORKER_ENGINE = None  # Engine of the current worker process, created by init_worker and kept between searches.
+
+
+class WorkerEngine(Engine):
+    """Engine used inside a worker process that also stops when the pool's shared stop event is set."""
+
+    def __init__(self, stop_event, **kwargs):
+        super().__init__(**kwargs)
+        self.stop_event = stop_event
+
+    def check_budget(self) -> None:
+        """Raises SearchTimeout if the pool was stopped or the search has used up its budget."""
+        if self.stop_event.is_set():
+            raise SearchTimeout()
+        super().check_budget()
+
+
+def init_worker(stop_event, table_memory_mb: float, tablebase_path: str, evaluation_path: str) -> None:
+    """Pool initializer that creates the worker's engine, so its transposition table lasts between searches. Each
+    worker maps the tablebase file itself, the operating system shares its pages between the workers."""
+    global WORKER_ENGINE
+    tablebase = open_tablebase(tablebase_path) if tablebase_path else None
+    WORKER_ENGINE = WorkerEngine(stop_event, table_memory_mb=table_memory_mb, tablebase=tablebase,
+                                 evaluation=load_evaluation(evaluation_path))
+
+
+def search_share(board: Bitboard, color: int, moves: list[Move], time_limit: float, node_limit: int,
+                 max_depth: int) -> dict:
+    """Worker task that runs iterative deepening over its share of the root moves. Returns the best move index and
+    exact score for every completed depth along with the worker's node count, transposition table use and search
+    time. A proven win ends every worker's search, a share whose moves all lose is finished without deepening it."""
+    engine = WORKER_ENGINE
+    engine.time_limit = time_limit
+    engine.node_limit = node_limit
+    start_time = engine.begin()
+    probes, hits = engine.table.probes, engine.table.hits
+
+    best = []  # (score, move index) of the best move for each completed depth.
+    order = list(range(len(moves)))
+    for depth in range(1, max_depth + 1):
+        try:
+            alpha = -WIN_SCORE - 1
+            best_index = order[0]
+            for index in order:
+                captured = board.make(moves[index])
+                score = -engine.negamax(board, 1 - color, depth - 1, -WIN_SCORE - 1, -alpha, 1)
+                board.unmake(moves[index], captured)
+                if score > alpha:
+                    alpha = score
+                    best_index = index
+        except SearchTimeout:
+            break
+        best.append((alpha, best_index))
+        order.remove(best_index)
+        order.insert(0, best_index)
+        if alpha >= WIN_SCORE - MAX_PLY:  # No other move can do better, the other workers can stop too.
+            engine.stop_event.set()
+            break
+        if alpha <= -WIN_SCORE + MAX_PLY or not engine.has_time_for_iteration(start_time):
+            break
+
+    return {'pid': os.getpid(), 'best': best, 'nodes': engine.nodes, 'tablebase_hits': engine.tablebase_hits,
+            'tt_probes': engine.table.probes - probes, 'tt_hits': engine.table.hits - hits,
+            'elapsed': perf_counter() - start_time}
+
+
+class ParallelEngine:
+    """
+    Searches with several processes by splitting the root moves between them, each worker running its own
+    iterative deepening search and keeping its own transposition table. The move returned is the best one at the
+    deepest iteration every worker completed, where a share whose moves all provably lose counts as losing at every
+    depth, and a proven win is returned at once. Has the same search, stop and statistics interface as Engine, so
+    the CPU player can use either.
+
+    Keyword Arguments:
+        workers: Number of worker processes.
+        time_limit: Seconds the search may run for, or 0 for no time limit.
+        node_limit: Number of positions each worker may visit, or 0 for no node limit.
+        max_depth: The deepest iteration to search.
+        table_memory_mb: Memory cap of each worker's transposition table in megabytes.
+        tablebase_path: Path of an endgame tablebase file for the workers to probe, if any.
+        evaluation_path: Path of a JSON file of evaluation weights for the workers to load, if any.
+
+    Attributes:
+        worker_statistics: Node count, transposition table hits, search time and nodes per second of each worker in
+            the last search.
+    """
+
+    def __init__(self,
+                 workers: int = os.cpu_count() or 1,
+                 time_limit: float = Engine.TIME_LIMIT,
+                 node_limit: int = Engine.NODE_LIMIT,
+                 max_depth: int = Engine.MAX_DEPTH,
+                 table_memory_mb: float = TranspositionTable.MEMORY_MB,
+                 tablebase_path: str = None,
+                 evaluation_path: str = None):
+
+        self.workers = max(1, workers)
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.max_depth = max_depth
+        self.table_memory_mb = table_memory_mb
+        self.tablebase_path = tablebase_path
+        self.evaluation_path = evaluation_path
+        self.stop_event = ProcessEvent()
+        self.executor: ProcessPoolExecutor = None
+        self.nodes = 0
+        self.tablebase_hits = 0
+        self.table_probes = 0
+        self.table_hits = 0
+        self.elapsed = 0
+        self.worker_statistics: list[dict] = []
+
+    def start_pool(self) -> None:
+        """Starts the worker processes if they are not running yet."""
+        if not self.executor:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                                initargs=(self.stop_event, self.table_memory_mb, self.tablebase_path,
+                                                          self.evaluation_path))
+
+    def search(self, board: Bitboard, color: int) -> SearchResult:
+        """Searches board for the best move of color within the time and node budget using every worker."""
+        start_time = perf_counter()
+        self.stop_event.clear()
+        self.nodes = 0
+        self.tablebase_hits = 0
+        self.table_probes = 0
+        self.table_hits = 0
+        self.worker_statistics = []
+
+        moves = generate_moves(board, color)
+        if not moves:
+            return SearchResult(None, -WIN_SCORE, 0, 0, 0)
+        shuffle(moves)  # Randomize equally scored moves for variation.
+        if len(moves) == 1:  # Forced moves are played without searching.
+            return SearchResult(moves[0], 0, 0, 0, perf_counter() - start_time)
+
+        # Deal the root moves out to the workers like cards, so each worker searches a similar share.
+        self.start_pool()
+        shares = [moves[worker::self.workers] for worker in range(min(self.workers, len(moves)))]
+        futures = [self.executor.submit(search_share, board, color, share, self.time_limit, self.node_limit,
+                                        self.max_depth) for share in shares]
+        wait(futures)
+        reports = [future.result() for future in futures]
+
+        for report in reports:
+            self.nodes += report['nodes']
+            self.tablebase_hits += report['tablebase_hits']
+            self.table_probes += report['tt_probes']
+            self.table_hits += report['tt_hits']
+            self.worker_statistics.append({
+                'pid': report['pid'],
+                'nodes': report['nodes'],
+                'tablebase_hits': report['tablebase_hits'],
+                'tt_hits': report['tt_hits'],
+                'elapsed': round(report['elapsed'], 3),
+                'nps': round(report['nodes'] / report['elapsed']) if report['elapsed'] else 0,
+            })
+        self.elapsed = perf_counter() - start_time
+
+        # A proven win is played at once. Otherwise the shares are compared at the deepest iteration all of them
+        # completed, since scores from different depths are not comparable. A share whose moves all provably lose
+        # loses at every depth, so it keeps its last score and does not limit the depth of the others.
+        wins = [(report['best'][-1][0], len(report['best']), share[report['best'][-1][1]])
+                for report, share in zip(reports, shares)
+                if report['best'] and report['best'][-1][0] >= WIN_SCORE - MAX_PLY]
+        if wins:
+            score, depth, move = max(wins, key=lambda result: result[0])
+            return SearchResult(move, score, depth, self.nodes, self.elapsed)
+        lost = [bool(report['best']) and report['best'][-1][0] <= -WIN_SCORE + MAX_PLY for report in reports]
+        depth = min((len(report['best']) for report, is_lost in zip(reports, lost) if not is_lost),
+                    default=max(len(report['best']) for report in reports))
+        if not depth:
+            return SearchResult(moves[0], 0, 0, self.nodes, self.elapsed)
+        results = [report['best'][-1 if is_lost else depth - 1] for report, is_lost in zip(reports, lost)]
+        score, move = max(((score, share[index]) for (score, index), share in zip(results, shares)),
+                          key=lambda result: result[0])
+        return SearchResult(move, score, depth, self.nodes, self.elapsed)
+
+    def stop(self) -> None:
+        """Ends the workers' current searches at their next budget check."""
+        self.stop_event.set()
+
+    def shutdown(self) -> None:
+        """Stops the worker processes."""
+        if self.executor:
+            self.stop()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def statistics(self) -> dict:
+        """Returns the overall node count, nodes per second and transposition table hits of the last search along with
+        each worker's."""
+        return {
+            'nodes': self.nodes,
+            'nps': round(self.nodes / self.elapsed) if self.elapsed else 0,
+            'tablebase_hits': self.tablebase_hits,
+            'tt_probes': self.table_probes,
+            'tt_hits': self.table_hits,
+            'tt_hit_rate': round(self.table_hits / self.table_probes, 3) if self.table_probes else 0.0,
+            'workers': self.worker_statistics,
+        }
+
+
+def main():
+    """Benchmarks the parallel search from a starting position with an increasing number of workers."""
+    parser = ArgumentParser(description="Report the nodes per second of the parallel CPU search.")
+    parser.add_argument('--dimensions', type=int, default=8, help="Length and width of the board in spaces.")
+    parser.add_argument('--rows', type=int, default=3, help="Number of rows of pawns.")
+    parser.add_argument('--time', type=float, default=2.0, help="Seconds to search for with each worker count.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1],
+                        help="Worker counts to benchmark.")
+    arguments = parser.parse_args()
+
+    board = Bitboard.starting(arguments.dimensions, arguments.rows)
+    for workers in arguments.workers:
+        engine = ParallelEngine(workers=workers, time_limit=arguments.time)
+        engine.start_pool()
+        result = engine.search(board, BLACK)
+        statistics = engine.statistics()
+        print(f'[{workers} WORKERS] depth: {result.depth}, nodes: {statistics["nodes"]}, nps: {statistics["nps"]}')
+        for worker in statistics['workers']:
+            print(f'    [WORKER {worker["pid"]}] nodes: {worker["nodes"]}, nps: {worker["nps"]}')
+        engine.shutdown()
+
+
+if __name__ == '__main__':
+    main()
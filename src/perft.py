@@ -0,0 +1,169 @@
+"""Perft (leaf node counts of the move tree) for checking the move generator's correctness and speed, without depending
+on pygame.
+
+Positions are written as <side>:B<squares>:R<squares>, where side is B or R for the color to move and squares is a
+comma separated list of playable square numbers, prefixed with K for kings. Playable squares are numbered from 1 in
+reading order, left to right from the top row down, so on 8 x 8 the black pawns start on 21 to 32.
+"""
+import sys
+from argparse import ArgumentParser
+from time import perf_counter
+
+from bitboard import Bitboard, BLACK_PAWN, RED_PAWN, BLACK, RED, squares
+from movegen import generate_moves
+
+# Known-good leaf counts as (dimensions, rows or None, position or None, counts from depth 1 up). The starting
+# positions cover every board size and row count offered in the menus. The 8 x 8 three row counts match the published
+# values for checkers with forced captures.
+KNOWN = [
+    (8, 3, None, [7, 49, 302, 1469, 7361, 36768, 179740]),
+    (8, 2, None, [7, 49, 392, 3136, 26592, 218695]),
+    (8, 1, None, [7, 49, 301, 1849, 11223, 68121, 414598]),
+    (10, 3, None, [9, 81, 810, 8100, 88900, 957965]),
+    (10, 2, None, [9, 81, 810, 8100, 87120, 937024]),
+    (10, 1, None, [9, 81, 657, 5329, 41829, 328329]),
+    (12, 3, None, [11, 121, 1452, 17424, 228360]),
+    (12, 2, None, [11, 121, 1452, 17424, 223080]),
+    (12, 1, None, [11, 121, 1221, 12321, 119547, 1159929]),
+    (14, 3, None, [13, 169, 2366, 33124, 500136]),
+    (14, 2, None, [13, 169, 2366, 33124, 491400]),
+    (14, 1, None, [13, 169, 2041, 24649, 285897]),
+    (16, 3, None, [15, 225, 3600, 57600]),
+    (16, 2, None, [15, 225, 3600, 57600]),
+    (16, 1, None, [15, 225, 3165, 44521]),
+    (18, 3, None, [17, 289, 5202, 93636]),
+    (18, 2, None, [17, 289, 5202, 93636]),
+    (18, 1, None, [17, 289, 4641, 74529]),
+    (20, 3, None, [19, 361, 7220, 144400]),
+    (20, 2, None, [19, 361, 7220, 144400]),
+    (20, 1, None, [19, 361, 6517, 117649]),
+    # A capture that promotes ends the move, even though the new king could jump again.
+    (8, None, 'B:B10:R6,7', [1, 2, 4, 8, 32, 56, 168, 336, 1260, 2250, 7250]),
+    # A king's capture chain may loop back through its own origin, in either direction.
+    (8, None, 'B:BK18:R14,15,22,23', [2, 0]),
+    # Branching king chains of different lengths, all of which may be played.
+    (8, None, 'B:BK18,29:R5,7,14,15,22,23', [4, 20, 93, 383, 1660, 7323, 28025, 135480]),
+    # Red to move with captures on both sides and a king.
+    (8, None, 'R:B18,26,27:R22,23,K10', [3, 6, 30, 81, 373, 1113, 5182, 15025, 70972]),
+    (10, None, 'B:BK23,K28:R17,18,29,30,K3', [2, 14, 63, 336, 1917, 11195, 61519]),
+    # Middlegames from random games on the large boards, the starting layouts only make contact deeper.
+    (16, None, 'R:BK21,56,71,78,88,90,97,101,102,106,110,119:R7,26,34,36,39,47,49,57,69,76,92,K123',
+     [2, 20, 38, 691, 12870, 229491]),
+    (20, None, 'B:B24,K28,79,111,112,116,135,143,153,160,170,180:R21,35,52,58,60,66,77,81,88,94,102,114,187',
+     [2, 21, 377, 6523, 116818]),
+]
+
+
+def parse_position(text: str, dimensions: int) -> tuple[Bitboard, int]:
+    """Returns the bitboard and color to move of a position written in the notation above."""
+    side, *fields = text.strip().split(':')
+    board = Bitboard(dimensions)
+    for field in fields:
+        color = {'B': BLACK, 'R': RED}[field[0].upper()]
+        for name in filter(None, field[1:].split(',')):
+            king = name[0].upper() == 'K'
+            index = int(name[1:] if king else name) - 1
+            row, col = divmod(index * 2, dimensions)
+            col += row % 2  # Playable squares are those where row + col is even.
+            pawn_id = BLACK_PAWN if color == BLACK else RED_PAWN
+            board.set(row, col, pawn_id + 2 if king else pawn_id)
+    return board, {'B': BLACK, 'R': RED}[side.upper()]
+
+
+def format_position(board: Bitboard, color: int) -> str:
+    """Returns a position written in the notation above."""
+    fields = []
+    for letter, pawn_id in (('B', BLACK_PAWN), ('R', RED_PAWN)):
+        names = [(square, str(square // 2 + 1)) for square in squares(board.masks[pawn_id])]
+        names += [(square, f'K{square // 2 + 1}') for square in squares(board.masks[pawn_id + 2])]
+        fields.append(letter + ','.join(name for square, name in sorted(names)))
+    return ':'.join(['B' if color == BLACK else 'R'] + fields)
+
+
+def perft(board: Bitboard, color: int, depth: int) -> int:
+    """Returns the number of move sequences depth plies long from the position, counting the last ply's moves
+    without playing them."""
+    if depth == 0:
+        return 1
+    moves = generate_moves(board, color)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        captured = board.make(move)
+        nodes += perft(board, 1 - color, depth - 1)
+        board.unmake(move, captured)
+    return nodes
+
+
+def divide(board: Bitboard, color: int, depth: int) -> list[tuple[tuple, int]]:
+    """Returns the perft count below each move of the position, for finding where two generators disagree."""
+    counts = []
+    for move in generate_moves(board, color):
+        captured = board.make(move)
+        counts.append((move.path, perft(board, 1 - color, depth - 1)))
+        board.unmake(move, captured)
+    return counts
+
+
+def check(max_depth: int) -> bool:
+    """Runs perft on every known position up to max_depth and prints the counts and speed. Returns whether every
+    count matched."""
+    passed = True
+    total_nodes = 0
+    start_time = perf_counter()
+    for dimensions, rows, position, counts in KNOWN:
+        if position:
+            board, color = parse_position(position, dimensions)
+            name = f'{dimensions} x {dimensions} {position}'
+        else:
+            board, color = Bitboard.starting(dimensions, rows), BLACK
+            name = f'{dimensions} x {dimensions}, {rows} rows'
+        for depth, expected in enumerate(counts[:max_depth], 1):
+            depth_start = perf_counter()
+            nodes = perft(board, color, depth)
+            elapsed = perf_counter() - depth_start
+            total_nodes += nodes
+            status = 'OK' if nodes == expected else f'FAIL (expected {expected})'
+            passed = passed and nodes == expected
+            print(f'[PERFT] {name}, depth {depth}: {nodes} {status}, '
+                  f'{nodes / elapsed if elapsed else 0:.0f} nodes/s')
+    elapsed = perf_counter() - start_time
+    print(f'[PERFT {"PASSED" if passed else "FAILED"}] {total_nodes} nodes in {elapsed:.1f}s '
+          f'({total_nodes / elapsed:.0f} nodes/s)')
+    return passed
+
+
+def main():
+    """Checks the known counts, or runs perft on a given position, from the command line."""
+    parser = ArgumentParser(description="Count the leaf nodes of the checkers move tree.")
+    parser.add_argument('--dimensions', type=int, default=8, help="Length and width of the board in spaces.")
+    parser.add_argument('--rows', type=int, default=3, help="Number of rows of pawns in the starting position.")
+    parser.add_argument('--position', default=None, help="Position to count from instead of the starting one.")
+    parser.add_argument('--depth', type=int, default=None,
+                        help="Depth to count to, without it every known count is checked.")
+    parser.add_argument('--divide', action='store_true', help="Print the count below each move.")
+    arguments = parser.parse_args()
+
+    if arguments.depth is None:
+        sys.exit(0 if check(max(len(counts) for *key, counts in KNOWN)) else 1)
+
+    if arguments.position:
+        board, color = parse_position(arguments.position, arguments.dimensions)
+    else:
+        board, color = Bitboard.starting(arguments.dimensions, arguments.rows), BLACK
+    start_time = perf_counter()
+    if arguments.divide:
+        counts = divide(board, color, arguments.depth)
+        for path, nodes in counts:
+            print(f'    {"-".join(str(square // 2 + 1) for square in path)}: {nodes}')
+        nodes = sum(nodes for path, nodes in counts)
+    else:
+        nodes = perft(board, color, arguments.depth)
+    elapsed = perf_counter() - start_time
+    print(f'[PERFT] {format_position(board, color)}, depth {arguments.depth}: {nodes} '
+          f'({nodes / elapsed if elapsed else 0:.0f} nodes/s)')
+
+
+if __name__ == '__main__':
+    main()
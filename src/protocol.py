@@ -0,0 +1,303 @@
+"""Text protocol for running the CPU's engine as a separate process, without depending on pygame.
+
+The game writes commands to the engine's stdin and reads its replies from stdout, one per line:
+
+    isready                         Replies readyok once the engine is set up.
+    newgame                         Forgets the positions remembered from earlier games.
+    position <dimensions> <fen>     Sets the position, written in perft.py's notation, e.g. B:B21,22:R1,K5.
+    go [time <s>] [nodes <n>] [depth <d>]
+                                    Searches the position within the limits, the engine's own for any not given.
+                                    Replies info <key> <value>... with the search's statistics, then bestmove.
+    stop                            Ends the running search early, it still replies with its bestmove.
+    quit                            Exits.
+
+    bestmove <move>                 The move found, its playable squares numbered as in perft.py joined by - for a
+                                    step and x for captures, e.g. 22-18 or 25x18x11, or none if there is no move.
+
+Any engine that speaks this protocol can stand in for the built-in one, which is this module run as a script.
+"""
+import os
+import sys
+from argparse import ArgumentParser
+from queue import Queue, Empty
+from subprocess import Popen, PIPE
+from threading import Lock, Thread
+from time import perf_counter
+
+from bitboard import Bitboard
+from evaluation import load_evaluation
+from movegen import Move, generate_moves
+from perft import parse_position, format_position
+from search import Engine, SearchResult, WIN_SCORE
+from tablebase import open_tablebase
+from transposition import TranspositionTable
+
+
+def format_move(move: Move) -> str:
+    """Returns a move written with its playable square numbers, e.g. 22-18 or 25x18x11."""
+    return ('x' if move.captures else '-').join(str(square // 2 + 1) for square in move.path)
+
+
+def parse_move(text: str, board: Bitboard, color: int) -> Move:
+    """Returns the legal move of color on board written as text, or None if there is no such move."""
+    numbers = tuple(int(number) for number in text.replace('x', '-').split('-'))
+    for move in generate_moves(board, color):
+        if tuple(square // 2 + 1 for square in move.path) == numbers:
+            return move
+    return None
+
+
+class EngineServer:
+    """
+    The engine side of the protocol, answering commands read from a text stream. Searches run on a worker thread so
+    a stop command can interrupt them.
+
+    Parameters:
+        engine: The search engine used to answer go commands.
+
+    Keyword Arguments:
+        output: Stream the replies are written to.
+    """
+
+    def __init__(self, engine: Engine, output=sys.stdout):
+        self.engine = engine
+        self.output = output
+        self.output_lock = Lock()  # Replies are written from both the command loop and the search thread.
+        self.board: Bitboard = None
+        self.color = 0
+        self.thread: Thread = None
+
+    def reply(self, line: str) -> None:
+        """Writes one reply line and flushes it, so the game reads it right away."""
+        with self.output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def handle(self, line: str) -> bool:
+        """Answers one command. Returns False once the engine should exit."""
+        command, *arguments = line.split()
+        if command == 'isready':
+            self.reply('readyok')
+        elif command == 'newgame':
+            self.wait()
+            self.engine.table.clear()
+        elif command == 'position':
+            self.wait()
+            self.board, self.color = parse_position(arguments[1], int(arguments[0]))
+        elif command == 'go' and not self.board:
+            self.reply('bestmove none')
+        elif command == 'go':
+            self.wait()
+            limits = dict(zip(arguments[::2], arguments[1::2]))
+            self.thread = Thread(target=self.go, args=(self.board.copy(), self.color, limits), daemon=True)
+            self.thread.start()
+        elif command == 'stop':
+            self.engine.stop()
+        elif command == 'quit':
+            self.engine.stop()
+            return False
+        return True
+
+    def go(self, board: Bitboard, color: int, limits: dict) -> None:
+        """Search thread body that searches within the limits and replies with the statistics and best move."""
+        engine = self.engine
+        node_limit, max_depth = engine.node_limit, engine.max_depth
+        engine.node_limit = int(limits.get('nodes', node_limit))
+        engine.max_depth = int(limits.get('depth', max_depth))
+        try:
+            result = engine.search(board, color, float(limits['time']) if 'time' in limits else None)
+        finally:
+            engine.node_limit, engine.max_depth = node_limit, max_depth
+        self.reply(f'info depth {result.depth} score {result.score} nodes {result.nodes} '
+                   f'time {result.elapsed:.3f} tablebase_hits {engine.tablebase_hits}')
+        self.reply(f'bestmove {format_move(result.move) if result.move else "none"}')
+
+    def wait(self) -> None:
+        """Waits for the running search, if any, to finish and reply."""
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def run(self, lines) -> None:
+        """Answers commands until quit or the end of the input."""
+        for line in lines:
+            if line.strip() and not self.handle(line):
+                break
+
+
+class EngineProcess:
+    """
+    Runs an engine speaking the protocol as a long-lived subprocess, launched once and reused for every search. A
+    crash of the engine does not take the game down: the process is restarted and the search retried once. Has the
+    same search, stop and statistics interface as Engine, so the CPU player can use either.
+
+    Keyword Arguments:
+        command: Command that launches the engine, the built-in engine if not given.
+        time_limit: Seconds each search may run for, or 0 for no time limit.
+        node_limit: Number of positions each search may visit, or 0 for no node limit.
+        max_depth: The deepest iteration to search.
+        table_memory_mb: Memory cap of the built-in engine's transposition table in megabytes.
+        tablebase_path: Path of an endgame tablebase file for the built-in engine to probe, if any.
+        evaluation_path: Path of a JSON file of evaluation weights for the built-in engine to load, if any.
+
+    Attributes:
+        last_info: Statistics the engine reported for its last search.
+        restarts: Number of times the engine had to be restarted after it exited.
+    """
+
+    READY_TIMEOUT = 30  # Seconds the engine may take to start up.
+    REPLY_GRACE = 5  # Seconds a search may run past its time limit before the engine is taken to be hung.
+    STOP_GRACE = 1  # Seconds the engine may take to reply to a stop, the game waits on it when a search is canceled.
+    POLL_INTERVAL = 0.1  # Seconds between checks of the reply deadline, which stop() may bring forward.
+
+    def __init__(self,
+                 command: list[str] = None,
+                 time_limit: float = Engine.TIME_LIMIT,
+                 node_limit: int = Engine.NODE_LIMIT,
+                 max_depth: int = Engine.MAX_DEPTH,
+                 table_memory_mb: float = TranspositionTable.MEMORY_MB,
+                 tablebase_path: str = None,
+                 evaluation_path: str = None):
+
+        if command is None:
+            command = [sys.executable, os.path.abspath(__file__), '--table-memory', str(table_memory_mb)]
+            if tablebase_path:
+                command += ['--tablebase', os.path.abspath(tablebase_path)]
+            if evaluation_path:
+                command += ['--weights', os.path.abspath(evaluation_path)]
+        self.command = command
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.max_depth = max_depth
+        self.process: Popen = None
+        self.lines: Queue = None  # Lines read from the engine's stdout, None once it exits.
+        self.ready = False  # Whether the engine answered isready since it was launched.
+        self.reply_deadline: float = None  # perf_counter() time the awaited reply is due by, None to wait forever.
+        self.stopped = False  # Whether the current search was asked to stop.
+        self.last_info: dict = {}
+        self.restarts = 0
+        self.start()
+
+    def start(self) -> None:
+        """Launches the engine and reads its replies on a thread, so the engine warms up while the game goes on."""
+        self.process = Popen(self.command, stdin=PIPE, stdout=PIPE, text=True, bufsize=1,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.lines = Queue()
+        self.ready = False
+        Thread(target=self.read, args=(self.process, self.lines), daemon=True).start()
+        self.send('isready')
+
+    @staticmethod
+    def read(process: Popen, lines: Queue) -> None:
+        """Reader thread body that queues every line the engine writes, then None when it exits."""
+        for line in process.stdout:
+            lines.put(line.strip())
+        lines.put(None)
+
+    def send(self, line: str) -> None:
+        """Writes one command line to the engine, ignoring an engine that already exited."""
+        try:
+            self.process.stdin.write(line + '\n')
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            pass
+
+    def receive(self, prefix: str, timeout: float = None) -> str:
+        """Returns the next reply starting with prefix, storing info lines on the way. Raises EOFError if the engine
+        exits first or does not reply within timeout seconds, or soon after a stop request."""
+        self.reply_deadline = perf_counter() + timeout if timeout else None
+        while True:
+            deadline = self.reply_deadline
+            if deadline is not None and perf_counter() > deadline:
+                raise EOFError(f"The engine did not reply {prefix} in time.")
+            try:
+                line = self.lines.get(timeout=EngineProcess.POLL_INTERVAL)
+            except Empty:
+                continue
+            if line is None:
+                raise EOFError("The engine exited.")
+            if line.startswith('info '):
+                fields = line.split()[1:]
+                self.last_info = dict(zip(fields[::2], fields[1::2]))
+            if line.startswith(prefix):
+                return line
+
+    def restart(self) -> None:
+        """Kills the engine if it is still running and launches it again."""
+        self.restarts += 1
+        print(f'[ENGINE RESTARTED] {" ".join(self.command)}')
+        self.process.kill()
+        self.start()
+
+    def search(self, board: Bitboard, color: int, time_limit: float = None) -> SearchResult:
+        """Has the engine search board for the best move of color within the time and node budget. An engine that
+        exits or hangs is restarted and the search retried once, unless the search was stopped, which then returns no
+        move."""
+        start_time = perf_counter()
+        self.last_info = {}
+        self.stopped = False
+        time_limit = self.time_limit if time_limit is None else time_limit
+        # An engine that neither replies nor exits is restarted, unless the search has no time limit to wait for.
+        timeout = time_limit + EngineProcess.REPLY_GRACE if time_limit else None
+        for attempt in range(2):
+            try:
+                if not self.ready:
+                    self.receive('readyok', EngineProcess.READY_TIMEOUT)
+                    self.ready = True
+                self.send(f'position {board.dimensions} {format_position(board, color)}')
+                self.send(f'go time {time_limit} nodes {self.node_limit} depth {self.max_depth}')
+                text = self.receive('bestmove ', timeout).split()[1]
+                break
+            except EOFError:
+                self.restart()
+                if self.stopped:  # The search's result is no longer wanted, don't keep the caller waiting.
+                    return SearchResult(None, 0, 0, 0, perf_counter() - start_time)
+        else:
+            raise RuntimeError("The engine exited or hung twice while searching.")
+
+        move = None if text == 'none' else parse_move(text, board, color)
+        if text != 'none' and not move:
+            raise RuntimeError(f"The engine played an illegal move: {text}.")
+        return SearchResult(move, int(self.last_info.get('score', -WIN_SCORE if not move else 0)),
+                            int(self.last_info.get('depth', 0)), int(self.last_info.get('nodes', 0)),
+                            perf_counter() - start_time)
+
+    def stop(self) -> None:
+        """Ends the engine's current search early, it then replies with its best move so far. An engine that does
+        not reply soon after is taken to be hung."""
+        self.stopped = True
+        self.send('stop')
+        grace_deadline = perf_counter() + EngineProcess.STOP_GRACE
+        if self.reply_deadline is None or self.reply_deadline > grace_deadline:
+            self.reply_deadline = grace_deadline
+
+    def shutdown(self) -> None:
+        """Asks the engine to exit, killing it if it does not."""
+        self.send('quit')
+        try:
+            self.process.wait(1)
+        except Exception:
+            self.process.kill()
+
+    def statistics(self) -> dict:
+        """Returns the statistics the engine reported for its last search along with its process id."""
+        return {'pid': self.process.pid, 'restarts': self.restarts, **self.last_info}
+
+
+def main():
+    """Runs the built-in engine on stdin and stdout."""
+    parser = ArgumentParser(description="Run the checkers engine behind a text protocol on stdin and stdout.")
+    parser.add_argument('--table-memory', type=float, default=TranspositionTable.MEMORY_MB,
+                        help="Transposition table size in megabytes.")
+    parser.add_argument('--tablebase', default=None, help="Path of an endgame tablebase file to probe.")
+    parser.add_argument('--weights', default=None, help="Path of a JSON file of evaluation weights.")
+    arguments = parser.parse_args()
+
+    engine = Engine(table_memory_mb=arguments.table_memory,
+                    tablebase=open_tablebase(arguments.tablebase) if arguments.tablebase else None,
+                    evaluation=load_evaluation(arguments.weights))
+    EngineServer(engine).run(sys.stdin)
+
+
+if __name__ == '__main__':
+    main()
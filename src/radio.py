@@ -1,10 +1,11 @@
-from pygame import Surface, Vector2, transform
+from pygame import Surface, Vector2, Rect
 from pygame.event import Event
 
 from asset import Asset
 from button import Button
 from config import BUTTON_PRESSED
 from filepaths import ARROW_ICON
+from images import IMAGES
 
 
 class RadioButtonGroup(Asset):
@@ -54,9 +55,9 @@ class RadioButtonGroup(Asset):
 
         self.selected_button = self.buttons[0]  # The default and initially selected Button is the first created Button.
 
-        # Scale the arrow icon so that the height of the icon is equal to the button height.
-        resolution = (int(ARROW_ICON.get_width() * icon_scale), int(ARROW_ICON.get_height() * icon_scale))
-        self.arrow_icon = transform.scale(ARROW_ICON.copy(), resolution)
+        # Scale the arrow icon, fetched from the cache when drawn, since the group is made before the display exists.
+        arrow_icon = IMAGES.get(ARROW_ICON)
+        self.arrow_size = (int(arrow_icon.get_width() * icon_scale), int(arrow_icon.get_height() * icon_scale))
         self.enabled = True
 
     def get_value(self):
@@ -90,18 +91,30 @@ class RadioButtonGroup(Asset):
                 identifier = e.identifier
 
         for button in self.buttons:  # Check if one of the buttons in the group was selected.
-            if identifier == id(button):
+            if identifier == id(button) and button != self.selected_button:
+                self.mark_dirty(self.arrow_rect(self.selected_button), self.arrow_rect(button))  # The arrow moves.
                 self.selected_button = button
             button.update(events)
 
+    def arrow_rect(self, button: "RadioButton") -> Rect:
+        """Returns the area of the arrow icon drawn to the left of button when it is selected."""
+        button_position = button.get_pos()
+        x = button_position.x - (self.arrow_size[0] + self.horizontal_separation)
+        y = button_position.y - (self.arrow_size[1] - self.button_height) / 2
+        return Rect((x, y), self.arrow_size)
+
+    def dirty_rects(self) -> list[Rect]:
+        """Returns the areas the group and its buttons changed since the last call and forgets them."""
+        rects = super().dirty_rects()
+        for button in self.buttons:
+            rects += button.dirty_rects()
+        return rects
+
     def draw(self, screen: Surface):
         """Draws the each button in the button group on the screen."""
         for button in self.buttons:
             if button == self.selected_button:  # Draw the arrow icon for the selected button.
-                button_position = button.get_pos()
-                x = button_position.x - (self.arrow_icon.get_width() + self.horizontal_separation)
-                y = button_position.y - (self.arrow_icon.get_height() - self.button_height) / 2
-                screen.blit(self.arrow_icon, Vector2(x, y))
+                screen.blit(IMAGES.get(ARROW_ICON, self.arrow_size), self.arrow_rect(button))
 
             button.draw(screen)
 
@@ -0,0 +1,142 @@
+"""Measures how the per-move costs of the engine and the network messages grow with the board size, without depending
+on pygame.
+
+Every cost is taken over the same sample of positions from random games on each board size and printed next to its
+ratio to the smallest board, alongside the ratio of the board areas. A cost that grows with the area is quadratic in
+the board's length, one that stays near 1 only grows with the pieces and moves involved.
+"""
+import random
+from argparse import ArgumentParser
+from time import perf_counter
+
+from bitboard import Bitboard, BLACK
+from movegen import Move, generate_moves
+from search import Engine
+
+# Defaults of the benchmark.
+DIMENSIONS = [8, 10, 12, 14, 16, 18, 20]
+POSITIONS = 200
+RANDOM_PLIES = 20  # Random plies played from the starting position to reach each sampled position.
+DEPTH = 3
+REPEATS = 5
+
+
+def sample_positions(dimensions: int, rows: int, count: int, plies: int, seed: int) -> list[tuple[Bitboard, int]]:
+    """Returns count positions with moves left, each reached by playing plies random moves."""
+    generator = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board, color = Bitboard.starting(dimensions, rows), BLACK
+        for ply in range(plies):
+            moves = generate_moves(board, color)
+            if not moves:
+                break
+            board.apply(generator.choice(moves))
+            color = 1 - color
+        if generate_moves(board, color):
+            positions.append((board, color))
+    return positions
+
+
+def grid_message(board: Bitboard) -> str:
+    """Returns the board state message the game used to send after every turn, one character per square."""
+    return 'BOARD,' + ''.join(''.join(map(str, line)) for line in board.to_grid())
+
+
+def read_grid_message(message: str, dimensions: int) -> Bitboard:
+    """Parses a board state message back into a bitboard, as the receiving game used to."""
+    state = message.split(',')[1]
+    return Bitboard.from_grid([[int(state[col + (row * dimensions)]) for col in range(dimensions)]
+                               for row in range(dimensions)])
+
+
+def move_message(move: Move) -> str:
+    """Returns the move message the game sends after every turn, the squares of the move's path."""
+    return 'MOVE,' + ','.join(map(str, move.path))
+
+
+def read_move_message(message: str, move_paths: dict) -> Move:
+    """Parses a move message back into the legal move it names."""
+    return move_paths[tuple(map(int, message.split(',')[1:]))]
+
+
+def best_time(function, repeats: int) -> float:
+    """Returns the fastest of repeats runs of function in seconds, the least disturbed by the rest of the system."""
+    times = []
+    for repeat in range(repeats):
+        start_time = perf_counter()
+        function()
+        times.append(perf_counter() - start_time)
+    return min(times)
+
+
+def measure(dimensions: int, rows: int, count: int, plies: int, depth: int, seed: int, repeats: int) -> dict:
+    """Returns the average per-move costs over the sampled positions of a board size, in microseconds and bytes."""
+    positions = sample_positions(dimensions, rows, count, plies, seed)
+    moves = [generate_moves(board, color) for board, color in positions]
+    played = [(board.copy(), position_moves[0]) for (board, color), position_moves in zip(positions, moves)]
+    searched = positions[:max(1, count // 10)]
+    engine = Engine(time_limit=0, max_depth=depth, table_memory_mb=1)
+    move_paths = [{move.path: move for move in position_moves} for position_moves in moves]
+
+    def generate():
+        for board, color in positions:
+            generate_moves(board, color)
+
+    def make_unmake():
+        for board, move in played:
+            board.unmake(move, board.make(move))
+
+    def search():
+        for board, color in searched:
+            engine.table.clear()
+            engine.search(board, color)
+
+    def grid_messages():
+        for board, color in positions:
+            read_grid_message(grid_message(board), dimensions)
+
+    def move_messages():
+        for position_moves, paths in zip(moves, move_paths):
+            read_move_message(move_message(position_moves[0]), paths)
+
+    nodes = 0
+    for board, color in searched:
+        engine.table.clear()
+        nodes += engine.search(board, color).nodes
+    return {
+        'movegen_us': best_time(generate, repeats) / len(positions) * 1e6,
+        'make_unmake_us': best_time(make_unmake, repeats) / len(played) * 1e6,
+        'search_us_per_node': best_time(search, repeats) / max(1, nodes) * 1e6,
+        'grid_message_us': best_time(grid_messages, repeats) / len(positions) * 1e6,
+        'grid_message_bytes': sum(len(grid_message(board)) for board, color in positions) / len(positions),
+        'move_message_us': best_time(move_messages, repeats) / len(positions) * 1e6,
+        'move_message_bytes': sum(len(move_message(position_moves[0])) for position_moves in moves) / len(moves),
+    }
+
+
+def main():
+    """Runs the benchmark from the command line."""
+    parser = ArgumentParser(description="Measure how per-move engine and network costs grow with the board size.")
+    parser.add_argument('--dimensions', type=int, nargs='+', default=DIMENSIONS, help="Board sizes to measure.")
+    parser.add_argument('--rows', type=int, default=3, help="Number of rows of pawns.")
+    parser.add_argument('--positions', type=int, default=POSITIONS, help="Positions sampled per board size.")
+    parser.add_argument('--plies', type=int, default=RANDOM_PLIES, help="Random plies played to reach a position.")
+    parser.add_argument('--depth', type=int, default=DEPTH, help="Depth of the searches timed per node.")
+    parser.add_argument('--repeats', type=int, default=REPEATS, help="Runs of each measurement, the fastest counts.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the random games.")
+    arguments = parser.parse_args()
+
+    smallest = min(arguments.dimensions)
+    baseline = None
+    for dimensions in sorted(arguments.dimensions):
+        costs = measure(dimensions, arguments.rows, arguments.positions, arguments.plies, arguments.depth,
+                        arguments.seed, arguments.repeats)
+        baseline = baseline or costs
+        print(f'[{dimensions} x {dimensions}] area ratio: {(dimensions / smallest) ** 2:.2f}')
+        for name, value in costs.items():
+            print(f'    {name}: {value:.1f} ({value / baseline[name]:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
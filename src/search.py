@@ -0,0 +1,272 @@
+"""Alpha-beta search engine that picks the CPU player's moves without depending on pygame."""
+from random import shuffle
+from threading import Lock
+from time import perf_counter
+from typing import NamedTuple
+
+from bitboard import Bitboard
+from evaluation import Evaluation
+from movegen import Move, generate_moves
+from tablebase import Tablebase, WIN, DRAW, MAX_DISTANCE
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+# Scores are in hundredths of a pawn from the perspective of the side to move.
+WIN_SCORE = 100000
+MAX_PLY = 128
+TABLEBASE_WIN = WIN_SCORE - 2000  # Below the scores of wins found by search.
+TABLEBASE_PIECE = MAX_DISTANCE + 1  # Tablebase wins with one pawn fewer on the board score higher than any distance.
+# Wins and losses of the search and the tablebase score beyond this and count their distance from the root, which the
+# transposition table stores from the position instead. Evaluations stay far below it.
+DECISIVE_SCORE = TABLEBASE_WIN - 2000
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search to unwind it once the time or node budget runs out."""
+    pass
+
+
+class SearchResult(NamedTuple):
+    """
+    Outcome of a search.
+
+    Attributes:
+        move: The best move found, or None if the side to move has no legal moves.
+        score: Score of the move for the side to move.
+        depth: Deepest iteration that was fully searched.
+        nodes: Number of positions visited.
+        elapsed: Seconds spent searching.
+    """
+    move: Move
+    score: int
+    depth: int
+    nodes: int
+    elapsed: float
+
+
+class Engine:
+    """
+    Negamax search with alpha-beta pruning and iterative deepening. Each iteration searches one ply deeper than the
+    last, and the best move of the deepest completed iteration is returned when the budget runs out.
+
+    Keyword Arguments:
+        time_limit: Seconds the search may run for, or 0 for no time limit.
+        node_limit: Number of positions the search may visit, or 0 for no node limit.
+        max_depth: The deepest iteration to search.
+        table_memory_mb: Memory cap of the transposition table in megabytes.
+        tablebase: Endgame tablebase probed for exact results once few enough pawns remain.
+        evaluation: Static evaluation scoring the positions at the horizon, the default weights if not given.
+
+    Attributes:
+        nodes: Number of positions visited by the current or last search.
+        tablebase_hits: Number of positions of the current or last search resolved by the tablebase.
+        stopped: Set by stop() to end the current search early, possibly from another thread.
+        deadline: perf_counter() time the current search must end by, or 0 for none.
+        table: Transposition table kept between searches, so positions seen on earlier turns are remembered.
+    """
+
+    TIME_LIMIT = 1.0
+    NODE_LIMIT = 0
+    MAX_DEPTH = 64
+    CHECK_INTERVAL = 255  # The budget is checked whenever nodes & CHECK_INTERVAL == 0.
+
+    def __init__(self,
+                 time_limit: float = TIME_LIMIT,
+                 node_limit: int = NODE_LIMIT,
+                 max_depth: int = MAX_DEPTH,
+                 table_memory_mb: float = TranspositionTable.MEMORY_MB,
+                 tablebase: Tablebase = None,
+                 evaluation: Evaluation = None):
+
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.max_depth = max_depth
+        self.table = TranspositionTable(table_memory_mb)
+        self.tablebase = tablebase
+        self.evaluation = evaluation or Evaluation()
+        self.tablebase_hits = 0
+        self.nodes = 0
+        self.deadline = 0
+        self.pending_deadline: float = None  # Deadline set by set_deadline() before the search began.
+        self.deadline_lock = Lock()  # Guards the deadline, which set_deadline() changes from another thread.
+        self.stopped = False
+
+    def search(self, board: Bitboard, color: int, time_limit: float = None) -> SearchResult:
+        """Searches board for the best move of color within the time and node budget. A time_limit replaces the
+        engine's own for this search only, 0 searches until stopped or max_depth is reached."""
+        start_time = self.begin(time_limit)
+        board = board.copy()  # Moves are made and unmade on the copy, a timeout may leave it mid-move.
+        moves = generate_moves(board, color)
+        if not moves:
+            return SearchResult(None, -WIN_SCORE, 0, 0, 0)
+        shuffle(moves)  # Randomize equally scored moves for variation.
+        if len(moves) == 1:  # Forced moves are played without searching.
+            return SearchResult(moves[0], 0, 0, 0, perf_counter() - start_time)
+
+        best_move = moves[0]
+        best_score = 0
+        completed = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self.search_root(board, color, moves, depth)
+            except SearchTimeout:
+                break
+            best_move, best_score, completed = move, score, depth
+
+            # Search the best move first in the next iteration so the window narrows quickly.
+            moves.remove(move)
+            moves.insert(0, move)
+
+            # Stop once a forced result is found or the next iteration would likely not finish in time.
+            if abs(score) >= WIN_SCORE - MAX_PLY or not self.has_time_for_iteration(start_time):
+                break
+
+        return SearchResult(best_move, best_score, completed, self.nodes, perf_counter() - start_time)
+
+    def begin(self, time_limit: float = None) -> float:
+        """Resets the node count, stop flag and deadline for a new search and returns its start time."""
+        start_time = perf_counter()
+        time_limit = self.time_limit if time_limit is None else time_limit
+        with self.deadline_lock:  # A deadline set before the search began replaces the time limit.
+            if self.pending_deadline is not None:
+                self.deadline = self.pending_deadline
+            else:
+                self.deadline = start_time + time_limit if time_limit else 0
+            self.pending_deadline = None
+        self.nodes = 0
+        self.tablebase_hits = 0
+        self.stopped = False
+        self.table.new_search()
+        return start_time
+
+    def has_time_for_iteration(self, start_time: float) -> bool:
+        """Returns whether another iteration is likely to finish, i.e. less than half of the time budget is used."""
+        return not self.deadline or perf_counter() - start_time <= (self.deadline - start_time) / 2
+
+    def search_root(self, board: Bitboard, color: int, moves: list[Move], depth: int) -> tuple[int, Move]:
+        """Searches every root move to depth and returns the best score and move."""
+        alpha = -WIN_SCORE - 1
+        best_move = moves[0]
+        for move in moves:
+            captured = board.make(move)
+            score = -self.negamax(board, 1 - color, depth - 1, -WIN_SCORE - 1, -alpha, 1)
+            board.unmake(move, captured)
+            if score > alpha:
+                alpha = score
+                best_move = move
+        return alpha, best_move
+
+    def negamax(self, board: Bitboard, color: int, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """Returns the score of board for color, searched depth plies deep within the (alpha, beta) window."""
+        self.nodes += 1
+        if not self.nodes & Engine.CHECK_INTERVAL:
+            self.check_budget()
+
+        # Few pawns remain, use the exact result. Wins closer to a capture and with fewer pawns left score higher, so
+        # the engine makes progress towards a win the tablebase says is there instead of only keeping it.
+        pieces = board.total()
+        if self.tablebase and pieces <= self.tablebase.max_pieces:
+            result, distance = self.tablebase.probe(board, color)
+            if result:
+                self.tablebase_hits += 1
+                if result == DRAW:
+                    return 0
+                score = TABLEBASE_WIN - ply - distance - pieces * TABLEBASE_PIECE
+                return score if result == WIN else -score
+
+        # Use the stored result if it was searched deep enough, otherwise try its best move first.
+        key = board.key(color)
+        entry = self.table.probe(key)
+        best_index = -1
+        if entry:
+            stored_depth, bound, score, best_index = entry
+            if stored_depth >= depth:
+                score = from_table(score, ply)
+                if bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha):
+                    return score
+
+        moves = generate_moves(board, color)
+        if not moves:  # The side to move has lost, prefer the quickest win and the slowest loss.
+            return -WIN_SCORE + ply
+        # Captures are forced, so keep searching through them to avoid misjudging a position mid-exchange.
+        if (depth <= 0 and not moves[0].captures) or ply >= MAX_PLY:
+            return self.evaluation.evaluate(board, color)
+
+        order = list(range(len(moves)))
+        if 0 < best_index < len(moves):
+            order[0], order[best_index] = best_index, 0
+
+        original_alpha = alpha
+        best = -WIN_SCORE - 1
+        for index in order:
+            captured = board.make(moves[index])
+            score = -self.negamax(board, 1 - color, depth - 1, -beta, -alpha, ply + 1)
+            board.unmake(moves[index], captured)
+            if score > best:
+                best = score
+                best_index = index
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        bound = UPPER if best <= original_alpha else LOWER if best >= beta else EXACT
+        self.table.store(key, depth, bound, to_table(best, ply), best_index)
+        return best
+
+    def check_budget(self) -> None:
+        """Raises SearchTimeout if the search was stopped or has used up its time or node budget."""
+        if self.stopped or (self.deadline and perf_counter() > self.deadline) or \
+                (self.node_limit and self.nodes >= self.node_limit):
+            raise SearchTimeout()
+
+    def set_deadline(self, deadline: float) -> None:
+        """Sets the perf_counter() time the current search must end by, from another thread. A search that has not
+        begun yet takes the deadline over when it begins, None withdraws a deadline it has not taken over."""
+        with self.deadline_lock:
+            self.pending_deadline = deadline
+            if deadline is not None:
+                self.deadline = deadline
+
+    def stop(self) -> None:
+        """Ends the current search at the next budget check, it then returns its best move so far."""
+        self.stopped = True
+
+    def principal_variation(self, board: Bitboard, color: int, length: int) -> list[Move]:
+        """Returns up to length moves of the best line from board with color to move, read back from the best moves
+        kept in the transposition table."""
+        board = board.copy()
+        line = []
+        while len(line) < length:
+            entry = self.table.probe(board.key(color))
+            if not entry:
+                break
+            moves = generate_moves(board, color)
+            if not 0 <= entry[3] < len(moves):
+                break
+            line.append(moves[entry[3]])
+            board.apply(moves[entry[3]])
+            color = 1 - color
+        return line
+
+    def statistics(self) -> dict:
+        """Returns the node count of the last search and the transposition table's statistics."""
+        return {'nodes': self.nodes, 'tablebase_hits': self.tablebase_hits, **self.table.statistics()}
+
+
+def to_table(score: int, ply: int) -> int:
+    """Converts a win or loss score, found by search or the tablebase, from distance to the root into distance to the
+    stored position."""
+    if score >= DECISIVE_SCORE:
+        return score + ply
+    if score <= -DECISIVE_SCORE:
+        return score - ply
+    return score
+
+
+def from_table(score: int, ply: int) -> int:
+    """Converts a stored win or loss score from distance to the stored position back into distance to the root."""
+    if score >= DECISIVE_SCORE:
+        return score - ply
+    if score <= -DECISIVE_SCORE:
+        return score + ply
+    return score
@@ -0,0 +1,130 @@
+"""Plays CPU versus CPU games headless across a process pool and streams their results to a JSONL file."""
+import json
+import os
+import random
+from argparse import ArgumentParser
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+from evaluation import load_evaluation
+from game import Game, BLACK_WIN, RED_WIN
+from search import Engine
+from tablebase import open_tablebase
+
+WORKER_ENGINE = None  # Engine of the current worker process, created by init_worker and kept between games.
+
+# Defaults of the simulator.
+GAMES = 100
+DEPTH = 4
+MAX_PLIES = 200  # Games reaching this many plies are drawn.
+REPETITIONS = 3  # Games are drawn once a position repeats this many times with the same side to move.
+RANDOM_PLIES = 2  # Opening plies played at random so the games differ.
+TABLE_MEMORY_MB = 4
+
+
+def init_worker(time_limit: float, node_limit: int, max_depth: int, table_memory_mb: float,
+                tablebase_path: str, evaluation_path: str) -> None:
+    """Pool initializer that creates the worker's engine, which plays both sides of every game it is given."""
+    global WORKER_ENGINE
+    tablebase = open_tablebase(tablebase_path) if tablebase_path else None
+    WORKER_ENGINE = Engine(time_limit=time_limit, node_limit=node_limit, max_depth=max_depth,
+                           table_memory_mb=table_memory_mb, tablebase=tablebase,
+                           evaluation=load_evaluation(evaluation_path))
+
+
+def play_game(number: int, dimensions: int, rows: int, max_plies: int, random_plies: int, seed: int) -> dict:
+    """Worker task that plays one game and returns its record: the result, why the game ended, every move played as
+    its path of squares and the search effort spent."""
+    engine = WORKER_ENGINE
+    engine.table.clear()  # Games are independent, so they do not inherit each other's table.
+    random.seed(seed + number)
+    start_time = perf_counter()
+    game = Game(dimensions, rows)
+    seen = Counter([game.bitboard.key(game.turn)])
+    moves = []
+    nodes = 0
+    reason = 'no moves'
+    while not game.result:
+        if len(moves) >= max_plies:
+            reason = 'move limit'
+            break
+        if len(moves) < random_plies:
+            move = random.choice(game.legal_moves)
+        else:
+            result = engine.search(game.bitboard, game.turn)
+            move = result.move
+            nodes += result.nodes
+        game.play_move(move)
+        game.end_turn()
+        moves.append(list(move.path))
+
+        key = game.bitboard.key(game.turn)
+        seen[key] += 1
+        if seen[key] >= REPETITIONS:
+            reason = 'repetition'
+            break
+
+    return {
+        'game': number,
+        'dimensions': dimensions,
+        'rows': rows,
+        'result': {BLACK_WIN: 'black', RED_WIN: 'red'}.get(game.result, 'draw'),
+        'reason': reason,
+        'plies': len(moves),
+        'moves': moves,
+        'nodes': nodes,
+        'elapsed': round(perf_counter() - start_time, 3),
+    }
+
+
+def main():
+    """Runs the simulator from the command line."""
+    parser = ArgumentParser(description="Play CPU versus CPU checkers games headless and record the results.")
+    parser.add_argument('--games', type=int, default=GAMES, help="Number of games to play.")
+    parser.add_argument('--dimensions', type=int, default=8, help="Length and width of the board in spaces.")
+    parser.add_argument('--rows', type=int, default=3, help="Number of rows of pawns.")
+    parser.add_argument('--time', type=float, default=0, help="Seconds per move, or 0 for no time limit.")
+    parser.add_argument('--nodes', type=int, default=0, help="Positions per move, or 0 for no node limit.")
+    parser.add_argument('--depth', type=int, default=DEPTH, help="Deepest iteration searched per move.")
+    parser.add_argument('--table-memory', type=float, default=TABLE_MEMORY_MB,
+                        help="Transposition table size of each worker in megabytes.")
+    parser.add_argument('--tablebase', default=None, help="Path of an endgame tablebase file to probe.")
+    parser.add_argument('--weights', default=None, help="Path of a JSON file of evaluation weights to play with.")
+    parser.add_argument('--max-plies', type=int, default=MAX_PLIES, help="Plies after which a game is drawn.")
+    parser.add_argument('--random-plies', type=int, default=RANDOM_PLIES, help="Opening plies played at random.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the first game, each game adds its number.")
+    parser.add_argument('--output', default='selfplay.jsonl', help="Path of the JSONL file to write.")
+    arguments = parser.parse_args()
+
+    start_time = perf_counter()
+    results = Counter()
+    plies = 0
+    with open(arguments.output, 'w') as output, \
+            ProcessPoolExecutor(max_workers=arguments.workers, initializer=init_worker,
+                                initargs=(arguments.time, arguments.nodes, arguments.depth, arguments.table_memory,
+                                          arguments.tablebase, arguments.weights)) as executor:
+        futures = [executor.submit(play_game, number, arguments.dimensions, arguments.rows, arguments.max_plies,
+                                   arguments.random_plies, arguments.seed) for number in range(arguments.games)]
+        for finished, future in enumerate(as_completed(futures), 1):
+            record = future.result()
+            output.write(json.dumps(record) + '\n')
+            output.flush()  # Stream the records so a long run can be followed or interrupted.
+            results[record['result']] += 1
+            plies += record['plies']
+            if finished % max(1, arguments.games // 10) == 0:
+                print(f'[SELFPLAY] {finished}/{arguments.games} games, {finished / (perf_counter() - start_time):.2f} '
+                      f'games/s')
+
+    elapsed = perf_counter() - start_time
+    games = max(1, arguments.games)
+    print(f'[SELFPLAY DONE] {arguments.games} games in {elapsed:.1f}s ({arguments.games / elapsed:.2f} games/s), '
+          f'average length: {plies / games:.1f} plies')
+    print(f'    black wins: {results["black"] / games:.1%}, red wins: {results["red"] / games:.1%}, '
+          f'draws: {results["draw"] / games:.1%}')
+    print(f'[RESULTS WRITTEN]: {arguments.output}')
+
+
+if __name__ == '__main__':
+    main()
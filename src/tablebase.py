@@ -0,0 +1,317 @@
+"""Endgame tablebases built by retrograde analysis and probed from a memory-mapped file, without depending on pygame.
+
+Positions are stored from the perspective of the side to move. Positions with red to move are rotated half a turn and
+have their colors swapped first, so every stored position has black (moving up the board) to move. Positions are
+grouped by material signature (own pawns, own kings, opponent pawns, opponent kings) and the squares of each group
+are ranked with the combinatorial number system, giving each position a fixed slot found in O(1). Every slot holds
+one byte: 0 for an impossible position, 1 for a draw, otherwise 2 + 2 * distance + (1 if lost). The distance is the
+number of moves until the position is converted, i.e. until a capture, or a loss for having no moves, ends the
+current material balance. It lets the engine make progress towards a win instead of only keeping it.
+
+File layout (little endian):
+    header: magic b'CKTB', version (H), dimensions (H), max pieces (H), signature count (H)
+    signature table: own pawns, own kings, opponent pawns, opponent kings (4 B), first slot (Q) for each signature
+    data: one byte per slot, starting at the first multiple of DATA_ALIGNMENT after the signature table
+"""
+import mmap
+import os
+from argparse import ArgumentParser
+from collections import deque
+from itertools import combinations
+from math import comb
+from struct import Struct
+from time import perf_counter
+
+from bitboard import Bitboard, BLACK_PAWN, RED_PAWN, BLACK_KING, RED_KING, BLACK, RED, geometry, squares
+from movegen import generate_moves
+
+# Results for the side to move, UNKNOWN is also used for impossible positions and positions not in the table.
+UNKNOWN = 0
+WIN = 1
+LOSS = 2
+DRAW = 3
+
+MAX_DISTANCE = 126  # Longer distances are stored as MAX_DISTANCE.
+
+MAGIC = b'CKTB'
+VERSION = 1
+HEADER = Struct('<4sHHHH')
+SIGNATURE = Struct('<BBBBQ')
+DATA_ALIGNMENT = 8
+MAX_PIECES = 3
+
+
+def signatures(max_pieces: int) -> list[tuple[int, int, int, int]]:
+    """Returns every material signature with 2 to max_pieces pawns and at least one pawn per side, fewest first."""
+    result = []
+    for total in range(2, max_pieces + 1):
+        for own in range(1, total):
+            for own_kings in range(own + 1):
+                for opponent_kings in range(total - own + 1):
+                    result.append((own - own_kings, own_kings, total - own - opponent_kings, opponent_kings))
+    return result
+
+
+def signature_size(signature: tuple[int, int, int, int], playable: int) -> int:
+    """Returns the number of slots of a signature, one for each way to place every group on the playable squares."""
+    size = 1
+    for count in signature:
+        size *= comb(playable, count)
+    return size
+
+
+def rank(indices: list[int]) -> int:
+    """Returns the colex rank of a sorted list of distinct playable square indices."""
+    return sum(comb(index, order + 1) for order, index in enumerate(indices))
+
+
+def normalize(board: Bitboard, color: int) -> tuple[tuple[int, int, int, int], list[list[int]]]:
+    """Returns the material signature and the sorted playable square indices of each group with color to move,
+    rotating the board and swapping colors when red is to move."""
+    masks = board.masks
+    if color == BLACK:
+        groups = [[square // 2 for square in squares(masks[pawn_id])]
+                  for pawn_id in (BLACK_PAWN, BLACK_KING, RED_PAWN, RED_KING)]
+    else:
+        last = board.dimensions * board.dimensions // 2 - 1  # Playable index reached by rotating index 0.
+        groups = [[last - square // 2 for square in squares(masks[pawn_id])][::-1]
+                  for pawn_id in (RED_PAWN, RED_KING, BLACK_PAWN, BLACK_KING)]
+    return tuple(len(group) for group in groups), groups
+
+
+def slot(groups: list[list[int]], signature: tuple[int, int, int, int], playable: int) -> int:
+    """Returns the slot of the groups within their signature's block."""
+    index = 0
+    for group, count in zip(groups, signature):
+        index = index * comb(playable, count) + rank(group)
+    return index
+
+
+class Tablebase:
+    """
+    Read-only endgame tablebase opened with mmap, so nothing is parsed or loaded up front besides the signature
+    table and the operating system shares the pages between processes.
+
+    Parameters:
+        path: Path of a tablebase file written by generate().
+
+    Attributes:
+        dimensions: Board size the tablebase covers.
+        max_pieces: Most pawns on the board in a covered position.
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.dimensions, self.max_pieces, count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} tablebase file.")
+
+        self.playable = self.dimensions * self.dimensions // 2
+        self.offsets = {}
+        for number in range(count):
+            *signature, first = SIGNATURE.unpack_from(self.data, HEADER.size + number * SIGNATURE.size)
+            self.offsets[tuple(signature)] = first
+        table_end = HEADER.size + count * SIGNATURE.size
+        self.data_start = table_end + (-table_end % DATA_ALIGNMENT)
+
+    def probe(self, board: Bitboard, color: int) -> tuple[int, int]:
+        """Returns (result, distance) for color to move on board, where result is WIN, LOSS or DRAW and distance is
+        the number of moves until the position is converted, or (UNKNOWN, 0) if the position is not covered."""
+        if board.dimensions != self.dimensions or board.total() > self.max_pieces:
+            return UNKNOWN, 0
+        signature, groups = normalize(board, color)
+        if signature not in self.offsets:
+            return UNKNOWN, 0
+        return decode(self.data[self.data_start + self.offsets[signature] + slot(groups, signature, self.playable)])
+
+    def close(self) -> None:
+        """Unmaps and closes the file."""
+        self.data.close()
+        self.file.close()
+
+
+def encode(result: int, distance: int) -> int:
+    """Returns the byte stored for a result and distance."""
+    if result == UNKNOWN or result == DRAW:
+        return result and 1
+    return 2 + 2 * min(distance, MAX_DISTANCE) + (result == LOSS)
+
+
+def decode(value: int) -> tuple[int, int]:
+    """Returns the (result, distance) of a stored byte."""
+    if value < 2:
+        return (DRAW if value else UNKNOWN), 0
+    return (LOSS if value & 1 else WIN), (value - 2) >> 1
+
+
+def open_tablebase(path: str) -> Tablebase:
+    """Returns the tablebase at path, or None if the file does not exist."""
+    return Tablebase(path) if os.path.exists(path) else None
+
+
+def generate(dimensions: int, max_pieces: int, path: str, verbose: bool = True) -> None:
+    """Solves every position with up to max_pieces pawns by retrograde analysis and writes the tablebase to path.
+
+    Positions are solved one piece count at a time, since captures only lead to positions with fewer pawns. Within a
+    piece count, positions whose result follows from their moves into already solved positions are resolved first.
+    Their results are then propagated backwards along the moves that lead to them, breadth first so that distances
+    come out shortest for wins and longest for losses: a parent with a losing child is won, and a parent whose
+    children are all won for the opponent is lost. Positions left unresolved can avoid losing forever and are
+    draws."""
+    playable = dimensions * dimensions // 2
+    all_signatures = signatures(max_pieces)
+    first_slots = {}
+    total_slots = 0
+    for signature in all_signatures:
+        first_slots[signature] = total_slots
+        total_slots += signature_size(signature, playable)
+    results = bytearray(total_slots)
+    distances = bytearray(total_slots)
+
+    # Squares of each playable index with black to move, and the rows where pawns cannot stand.
+    playable_squares = [square for square in range(dimensions * dimensions)
+                        if (square // dimensions + square % dimensions) % 2 == 0]
+    black_promotion = geometry(dimensions)['promotion'][BLACK]
+    red_promotion = geometry(dimensions)['promotion'][RED]
+
+    for total in range(2, max_pieces + 1):
+        start_time = perf_counter()
+        level = [signature for signature in all_signatures if sum(signature) == total]
+        parents = {}  # Slot of a position -> slots of the positions with the same piece count that move into it.
+        remaining = {}  # Slot of a position -> number of its moves into unresolved positions of the same piece count.
+        drawn = set()  # Slots of positions with a move into a drawn position.
+        lost = []  # Slots of positions without moves, the first to be propagated.
+        queue = deque()
+
+        for signature in level:
+            for groups in placements(signature, playable):
+                masks = [0, 0, 0, 0, 0]
+                for group, pawn_id in zip(groups, (BLACK_PAWN, BLACK_KING, RED_PAWN, RED_KING)):
+                    for index in group:
+                        masks[pawn_id] |= 1 << playable_squares[index]
+                # Skip overlapping pawns and pawns standing on the row they would have been promoted on.
+                if sum(mask.bit_count() for mask in masks) != total or masks[BLACK_PAWN] & black_promotion or \
+                        masks[RED_PAWN] & red_promotion:
+                    continue
+
+                board = Bitboard(dimensions, masks)
+                position = first_slots[signature] + slot(groups, signature, playable)
+                result, children, has_draw = classify(board, results, first_slots, playable, total)
+                if result:
+                    results[position] = result
+                    if result == LOSS and children is None:
+                        lost.append(position)
+                    else:
+                        distances[position] = 1
+                        queue.append(position)
+                    continue
+
+                remaining[position] = len(children)
+                if has_draw:
+                    drawn.add(position)
+                for child in children:
+                    parents.setdefault(child, []).append(position)
+
+        # Propagate resolved results backwards to the positions that move into them, nearest results first.
+        queue.extendleft(lost)
+        while queue:
+            child = queue.popleft()
+            for parent in parents.get(child, ()):
+                if results[parent]:
+                    continue
+                if results[child] == LOSS:
+                    results[parent] = WIN
+                else:
+                    if results[child] == DRAW:
+                        drawn.add(parent)
+                    remaining[parent] -= 1
+                    if remaining[parent]:
+                        continue
+                    results[parent] = DRAW if parent in drawn else LOSS
+                distances[parent] = min(distances[child] + 1, MAX_DISTANCE)
+                queue.append(parent)
+
+        for position in remaining:
+            if not results[position]:
+                results[position] = DRAW
+
+        if verbose:
+            print(f'[TABLEBASE] {total} pieces: {len(level)} signatures solved in {perf_counter() - start_time:.1f}s')
+
+    for position, result in enumerate(results):
+        results[position] = encode(result, distances[position])
+    write(path, dimensions, max_pieces, all_signatures, first_slots, results)
+
+
+def placements(signature: tuple[int, int, int, int], playable: int):
+    """Yields every way to place the groups of a signature on the playable squares, overlaps included."""
+    def place(group: int, groups: list):
+        if group == len(signature):
+            yield groups
+            return
+        for indices in combinations(range(playable), signature[group]):
+            yield from place(group + 1, groups + [list(indices)])
+    yield from place(0, [])
+
+
+def classify(board: Bitboard, results: bytearray, first_slots: dict, playable: int,
+             total: int) -> tuple[int, list[int], bool]:
+    """Classifies black's moves on board. Returns (result, children, has_draw) where result is set if the position
+    is already decided by its moves into solved positions, children are the slots of positions with the same piece
+    count still to be solved (None when black has no moves), and has_draw is whether a move reaches a drawn
+    position."""
+    moves = generate_moves(board, BLACK)
+    if not moves:
+        return LOSS, None, False
+
+    children = []
+    has_draw = False
+    for move in moves:
+        child = board.copy()
+        child.apply(move)
+        if not child.pieces(RED):  # Capturing the last red pawn wins.
+            return WIN, [], False
+        signature, groups = normalize(child, RED)
+        child_slot = first_slots[signature] + slot(groups, signature, playable)
+        if sum(signature) < total:
+            child_result = results[child_slot]
+            if child_result == LOSS:
+                return WIN, [], False
+            has_draw = has_draw or child_result == DRAW
+        else:
+            children.append(child_slot)
+
+    if not children:  # Every move leads into a solved position that is not lost for the opponent.
+        return DRAW if has_draw else LOSS, [], False
+    return UNKNOWN, children, has_draw
+
+
+def write(path: str, dimensions: int, max_pieces: int, all_signatures: list, first_slots: dict,
+          results: bytearray) -> None:
+    """Writes the header, signature table and encoded results to path."""
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, dimensions, max_pieces, len(all_signatures)))
+        for signature in all_signatures:
+            file.write(SIGNATURE.pack(*signature, first_slots[signature]))
+        table_end = HEADER.size + len(all_signatures) * SIGNATURE.size
+        file.write(bytes(-table_end % DATA_ALIGNMENT))
+        file.write(results)
+
+
+def main():
+    """Generates a tablebase file from the command line."""
+    parser = ArgumentParser(description="Generate a checkers endgame tablebase by retrograde analysis.")
+    parser.add_argument('--dimensions', type=int, default=8, help="Length and width of the board in spaces.")
+    parser.add_argument('--pieces', type=int, default=MAX_PIECES, help="Most pawns on the board in a position.")
+    parser.add_argument('--output', default=None, help="Path of the tablebase file to write.")
+    arguments = parser.parse_args()
+
+    path = arguments.output or os.path.join('../assets/data', f'endgame_{arguments.dimensions}.tb')
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    generate(arguments.dimensions, arguments.pieces, path)
+    print(f'[TABLEBASE WRITTEN]: {path} ({os.path.getsize(path)} bytes)')
+
+
+if __name__ == '__main__':
+    main()
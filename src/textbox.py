@@ -76,6 +76,8 @@ class TextBox(Asset):
 
     def create_label(self):
         """Internally creates the label surface for displaying the text and adjusts the hitbox accordingly."""
+        if self.hitbox:  # The old label's area is redrawn too, in case the new one is narrower.
+            self.mark_dirty(self.hitbox)
         self.text_label = Label(text=self.text,
                                 position=self.position,
                                 font_size=self.font_size,
@@ -86,6 +88,7 @@ class TextBox(Asset):
         self.hitbox = Rect(self.position, self.text_label.get_dimensions())
         self.width = self.text_label.get_width()
         self.height = self.text_label.get_height()
+        self.mark_dirty(self.hitbox)
 
     def set_value(self, text: str) -> None:
         """Sets the value of the textbox (self.text)."""
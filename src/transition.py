@@ -1,4 +1,4 @@
-from pygame import draw, Surface
+from pygame import draw, Surface, Rect
 from pygame.event import Event, post
 
 from asset import Asset
@@ -39,6 +39,7 @@ class Transition(Asset):
             if e.type == FRAME_TIMER:
                 dt = e.dt
 
+        previous_radius = self.radius
         self.radius += self.velocity * dt
         if self.radius > (SCREEN_WIDTH + SCREEN_HEIGHT):  # Check if the transition is paused.
             self.radius = SCREEN_WIDTH + SCREEN_HEIGHT
@@ -47,6 +48,11 @@ class Transition(Asset):
         elif self.radius < 0:  # Check if the transition ended.
             post(Event(TRANSITION_END))
 
+        # The circle covers the larger of its two sizes, both when it grows and when it shrinks to reveal the scene.
+        radius = max(previous_radius, self.radius, 0)
+        diameter = int(radius) * 2 + 2
+        self.mark_dirty(Rect(0, 0, diameter, diameter).move(SCREEN_CENTER - Vector2(diameter, diameter) / 2))
+
     def draw(self, screen: Surface) -> None:
         """Draws the textbox on the screen."""
         draw.circle(screen, self.color, SCREEN_CENTER, self.radius)
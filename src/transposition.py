@@ -0,0 +1,107 @@
+"""Fixed-size transposition table of search results keyed by Zobrist hash, without depending on pygame."""
+from array import array
+
+# Constants for the kind of bound a stored score is.
+EXACT = 0
+LOWER = 1  # The search failed high, the real score is at least the stored score.
+UPPER = 2  # The search failed low, the real score is at most the stored score.
+
+# Bit layout of the packed entry data: score, depth, bound, best move index + 1 (0 for none) and generation.
+SCORE_BITS = 21
+DEPTH_BITS = 8
+BOUND_BITS = 2
+MOVE_BITS = 12
+SCORE_OFFSET = 1 << (SCORE_BITS - 1)
+DEPTH_SHIFT = SCORE_BITS
+BOUND_SHIFT = DEPTH_SHIFT + DEPTH_BITS
+MOVE_SHIFT = BOUND_SHIFT + BOUND_BITS
+GENERATION_SHIFT = MOVE_SHIFT + MOVE_BITS
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table remembering the depth, bound, score and best move of searched positions. Each entry is
+    two unsigned 64 bit integers (the full key and the packed data) in preallocated arrays, so the memory used is
+    fixed by memory_mb. When two positions share a slot, the new result replaces the old one if the old one is
+    from an earlier search or was not searched deeper.
+
+    Keyword Arguments:
+        memory_mb: Memory cap of the table in megabytes, rounded down to a power of two number of entries.
+
+    Attributes:
+        probes: Number of lookups.
+        hits: Number of lookups that found the position.
+        stores: Number of results stored.
+        replacements: Number of stores that evicted a different position.
+    """
+
+    MEMORY_MB = 16
+    ENTRY_BYTES = 16
+
+    def __init__(self, memory_mb: float = MEMORY_MB):
+        entries = max(1, int(memory_mb * 1024 * 1024) // TranspositionTable.ENTRY_BYTES)
+        self.size = 1 << (entries.bit_length() - 1)
+        self.mask = self.size - 1
+        self.keys = array('Q', bytes(8 * self.size))
+        self.data = array('Q', bytes(8 * self.size))
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def new_search(self) -> None:
+        """Ages the stored entries so that results from earlier searches are replaced first."""
+        self.generation = (self.generation + 1) & 0xFF
+
+    def clear(self) -> None:
+        """Empties the table and resets the statistics."""
+        self.keys = array('Q', bytes(8 * self.size))
+        self.data = array('Q', bytes(8 * self.size))
+        self.probes = self.hits = self.stores = self.replacements = 0
+
+    def probe(self, key: int) -> tuple[int, int, int, int]:
+        """Returns the (depth, bound, score, move index) stored for key, or None if the position is not stored. The
+        move index is the best move's index in movegen.generate_moves order, or -1 if there is none."""
+        self.probes += 1
+        slot = key & self.mask
+        data = self.data[slot]
+        if not data or self.keys[slot] != key:
+            return None
+        self.hits += 1
+        return ((data >> DEPTH_SHIFT) & ((1 << DEPTH_BITS) - 1),
+                (data >> BOUND_SHIFT) & ((1 << BOUND_BITS) - 1),
+                (data & ((1 << SCORE_BITS) - 1)) - SCORE_OFFSET,
+                ((data >> MOVE_SHIFT) & ((1 << MOVE_BITS) - 1)) - 1)
+
+    def store(self, key: int, depth: int, bound: int, score: int, move_index: int) -> None:
+        """Stores a search result for key, keeping the existing entry instead if it is deeper and from this search."""
+        slot = key & self.mask
+        old = self.data[slot]
+        if old and self.keys[slot] != key:
+            if (old >> GENERATION_SHIFT) == self.generation and (old >> DEPTH_SHIFT) & ((1 << DEPTH_BITS) - 1) > depth:
+                return
+            self.replacements += 1
+
+        self.stores += 1
+        self.keys[slot] = key
+        self.data[slot] = ((score + SCORE_OFFSET)
+                           | (max(depth, 0) << DEPTH_SHIFT)
+                           | (bound << BOUND_SHIFT)
+                           | ((move_index + 1) << MOVE_SHIFT)
+                           | (self.generation << GENERATION_SHIFT))
+
+    def hit_rate(self) -> float:
+        """Returns the fraction of lookups that found the position."""
+        return self.hits / self.probes if self.probes else 0.0
+
+    def statistics(self) -> dict:
+        """Returns the table's usage statistics."""
+        return {
+            'tt_entries': self.size,
+            'tt_probes': self.probes,
+            'tt_hits': self.hits,
+            'tt_hit_rate': round(self.hit_rate(), 3),
+            'tt_stores': self.stores,
+            'tt_replacements': self.replacements,
+        }
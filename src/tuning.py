@@ -0,0 +1,177 @@
+"""Fits the evaluation weights to the outcomes of self-play games with NumPy, without depending on pygame.
+
+The games written by selfplay.py are replayed to collect quiet positions, those where the side to move has no capture,
+labeled with the game's result for black: 1 for a win, 0.5 for a draw and 0 for a loss. Every feature of every
+position is extracted in one pass over an (N, dimensions, dimensions) array, and the weights are fit either by
+logistic regression, predicting the result from the score, or by least squares on the result directly. The weights are
+scaled so a pawn is worth 100 and written to the JSON file the engine loads.
+"""
+import json
+import os
+from argparse import ArgumentParser
+from time import perf_counter
+
+import numpy as np
+
+from batch import sides, movers, steps, jumps
+from bitboard import Bitboard, RED_PAWN, BLACK_PAWN, RED_KING, BLACK_KING, BLACK, RED
+from evaluation import Evaluation, FEATURES, features
+from movegen import generate_moves
+
+RESULTS = {'black': 1.0, 'draw': 0.5, 'red': 0.0}  # Result of a game for black.
+
+# Defaults of the tuner.
+SKIP_PLIES = 8  # Opening plies whose positions are not used, they are mostly random or from the book.
+ITERATIONS = 50  # Newton steps of the logistic regression.
+REGULARIZATION = 1e-3  # Ridge penalty keeping the fit stable when a feature barely varies.
+CHECK_POSITIONS = 500  # Positions whose features are compared against the scalar extraction.
+
+
+def read_positions(path: str, skip_plies: int) -> tuple[list[Bitboard], np.ndarray]:
+    """Replays every game of a self-play JSONL file and returns its quiet positions after skip_plies along with the
+    result of their game for black."""
+    positions = []
+    results = []
+    with open(path) as file:
+        for line in filter(str.strip, file):
+            record = json.loads(line)
+            result = RESULTS[record['result']]
+            board = Bitboard.starting(record['dimensions'], record['rows'])
+            color = BLACK
+            for ply, path_squares in enumerate(record['moves']):
+                moves = {move.path: move for move in generate_moves(board, color)}
+                if ply >= skip_plies and not any(move.captures for move in moves.values()):
+                    positions.append(board.copy())
+                    results.append(result)
+                board.apply(moves[tuple(path_squares)])
+                color = 1 - color
+    return positions, np.array(results)
+
+
+def feature_matrix(boards: np.ndarray) -> np.ndarray:
+    """Returns the (N, len(FEATURES)) matrix of the features of an (N, dimensions, dimensions) array of positions,
+    each counted for black minus red as evaluation.py does."""
+    count = len(boards)
+    dimensions = boards.shape[1]
+    rows = np.arange(dimensions)[None, :, None]
+    black_pawns = boards == BLACK_PAWN
+    red_pawns = boards == RED_PAWN
+    quarter = dimensions // 4
+    middle = (slice(None), slice(quarter, dimensions - quarter), slice(quarter, dimensions - quarter))
+    black = black_pawns | (boards == BLACK_KING)
+    red = red_pawns | (boards == RED_KING)
+
+    mobility = np.zeros(count, dtype=np.int64)
+    for color, sign in ((BLACK, 1), (RED, -1)):
+        own, opponents = sides(boards, np.full(count, color))
+        allowed = movers(boards, own)
+        mobility += sign * (steps(boards, allowed).sum(axis=(1, 2, 3)) +
+                            jumps(boards, allowed, opponents).sum(axis=(1, 2, 3)))
+
+    columns = {
+        'material': black_pawns.sum(axis=(1, 2)) - red_pawns.sum(axis=(1, 2)),
+        'kings': (boards == BLACK_KING).sum(axis=(1, 2)) - (boards == RED_KING).sum(axis=(1, 2)),
+        'advancement': (black_pawns * (dimensions - 1 - rows)).sum(axis=(1, 2)) - (red_pawns * rows).sum(axis=(1, 2)),
+        'back_rank': black_pawns[:, -1].sum(axis=1) - red_pawns[:, 0].sum(axis=1),
+        'mobility': mobility,
+        'center': black[middle].sum(axis=(1, 2)) - red[middle].sum(axis=(1, 2)),
+    }
+    return np.column_stack([columns[name] for name in FEATURES]).astype(np.float64)
+
+
+def check_features(positions: list[Bitboard], matrix: np.ndarray, count: int) -> int:
+    """Compares the first count rows of the matrix against the scalar features of the same positions. Returns the
+    number of positions that differ."""
+    return sum(features(board) != matrix[index].tolist() for index, board in enumerate(positions[:count]))
+
+
+def fit_logistic(matrix: np.ndarray, results: np.ndarray, iterations: int, regularization: float) -> np.ndarray:
+    """Returns the weights of the logistic regression predicting the results from the features, fit with Newton's
+    method. No intercept is fit, so a balanced position keeps a score of 0."""
+    weights = np.zeros(matrix.shape[1])
+    penalty = regularization * len(matrix) * np.eye(matrix.shape[1])
+    for iteration in range(iterations):
+        predictions = 1 / (1 + np.exp(-(matrix @ weights)))
+        gradient = matrix.T @ (results - predictions) - penalty @ weights
+        hessian = (matrix * (predictions * (1 - predictions))[:, None]).T @ matrix + penalty
+        step = np.linalg.solve(hessian, gradient)
+        weights += step
+        if np.abs(step).max() < 1e-9:
+            break
+    return weights
+
+
+def fit_least_squares(matrix: np.ndarray, results: np.ndarray) -> np.ndarray:
+    """Returns the least squares weights predicting the results, centered on 0 for a draw, from the features."""
+    return np.linalg.lstsq(matrix, 2 * results - 1, rcond=None)[0]
+
+
+def scale_weights(weights: np.ndarray, names: list[str]) -> dict:
+    """Returns the fit weights by name, scaled so a pawn is worth 100."""
+    pawn = weights[names.index('material')]
+    if pawn <= 0:
+        raise ValueError("The fit gives pawns no positive value, more games are needed.")
+    return {name: round(float(weight * 100 / pawn), 2) for name, weight in zip(names, weights)}
+
+
+def main():
+    """Fits the evaluation weights from the command line."""
+    parser = ArgumentParser(description="Fit the CPU's evaluation weights to the outcomes of self-play games.")
+    parser.add_argument('--input', default='selfplay.jsonl', help="Path of the self-play JSONL file to read.")
+    parser.add_argument('--output', default=None, help="Path of the weights file to write.")
+    parser.add_argument('--method', choices=('logistic', 'lstsq'), default='logistic', help="How to fit the weights.")
+    parser.add_argument('--features', nargs='+', choices=FEATURES, default=list(FEATURES),
+                        help="Features to fit, the others are given no weight.")
+    parser.add_argument('--skip-plies', type=int, default=SKIP_PLIES, help="Opening plies whose positions are skipped.")
+    parser.add_argument('--iterations', type=int, default=ITERATIONS, help="Newton steps of the logistic regression.")
+    parser.add_argument('--regularization', type=float, default=REGULARIZATION, help="Ridge penalty of the fit.")
+    arguments = parser.parse_args()
+    if 'material' not in arguments.features:
+        parser.error("material must be fit, the other weights are scaled against it.")
+
+    start_time = perf_counter()
+    positions, results = read_positions(arguments.input, arguments.skip_plies)
+    if not positions:
+        parser.error(f"{arguments.input} has no quiet positions after ply {arguments.skip_plies}.")
+    dimensions = {board.dimensions for board in positions}
+    if len(dimensions) > 1:
+        parser.error("The games must all be played on the same board size.")
+    dimensions = dimensions.pop()
+    print(f'[POSITIONS READ] {len(positions)} quiet positions in {perf_counter() - start_time:.1f}s')
+
+    start_time = perf_counter()
+    grids = np.array([board.to_grid() for board in positions], dtype=np.int8)
+    matrix = feature_matrix(grids)
+    mismatches = check_features(positions, matrix, CHECK_POSITIONS)
+    print(f'[FEATURES EXTRACTED] {matrix.shape[0]} x {matrix.shape[1]} in {perf_counter() - start_time:.2f}s, '
+          f'{mismatches} mismatches against the scalar features')
+    if mismatches:
+        raise SystemExit(1)
+
+    columns = [FEATURES.index(name) for name in arguments.features]
+    selected = matrix[:, columns]
+    if arguments.method == 'logistic':
+        fit = fit_logistic(selected, results, arguments.iterations, arguments.regularization)
+    else:
+        fit = fit_least_squares(selected, results)
+    weights = {name: 0 for name in FEATURES}
+    try:
+        weights.update(scale_weights(fit, arguments.features))
+    except ValueError as error:
+        parser.error(str(error))
+    for name in FEATURES:
+        print(f'    {name}: {weights[name]}')
+
+    evaluation = Evaluation(weights)
+    scores = np.array([evaluation.evaluate(board, BLACK) for board in positions])
+    agreement = np.mean(np.sign(scores[results != 0.5]) == np.sign(2 * results[results != 0.5] - 1))
+    print(f'[FIT] decisive positions scored for the eventual winner: {agreement:.1%}')
+
+    path = arguments.output or os.path.join('../assets/data', f'evaluation_{dimensions}.json')
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    evaluation.save(path)
+    print(f'[WEIGHTS WRITTEN]: {path}')
+
+
+if __name__ == '__main__':
+    main()